@@ -0,0 +1,87 @@
+import hashlib
+import json
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .models import IdempotencyKey
+
+
+HEADER = 'Idempotency-Key'
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(request):
+    """Hash of who sent the request and what it asked for"""
+    payload = json.dumps(
+        [request.method, request.path, request.user.pk, request.data],
+        cls=DjangoJSONEncoder, sort_keys=True, default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def claim_key(scope, key, fingerprint):
+    """Insert the key, or return (existing row, False) if it is already stored
+
+    The insert goes first so the unique index does the locking: a concurrent
+    request with the same key waits on it until the first request's
+    transaction ends, then sees its stored response.
+    """
+    try:
+        with transaction.atomic():
+            return IdempotencyKey.objects.create(scope=scope, key=key, fingerprint=fingerprint), True
+    except IntegrityError:
+        pass
+    record = IdempotencyKey.objects.select_for_update().get(scope=scope, key=key)
+    if record.created_at < IdempotencyKey.expiry_cutoff():
+        record.delete()
+        return claim_key(scope, key, fingerprint)
+    return record, False
+
+
+def idempotent(scope):
+    """Make a DRF POST view safe to retry with an Idempotency-Key header
+
+    The first request with a key runs the view and stores its response in
+    the same transaction. Retries get that response back without running
+    the view again. Server errors are not stored, so the client can retry
+    them. Requests without the header are unaffected.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            key = request.headers.get(HEADER)
+            if not key:
+                return view(request, *args, **kwargs)
+            if len(key) > MAX_KEY_LENGTH:
+                return Response({
+                    'success': False,
+                    'error': f'{HEADER} must be at most {MAX_KEY_LENGTH} characters'
+                }, status=status.HTTP_400_BAD_REQUEST)
+
+            fingerprint = request_fingerprint(request)
+            with transaction.atomic():
+                record, created = claim_key(scope, key, fingerprint)
+                if not created:
+                    if record.fingerprint != fingerprint:
+                        return Response({
+                            'success': False,
+                            'error': f'{HEADER} was already used for a different request'
+                        }, status=status.HTTP_422_UNPROCESSABLE_ENTITY)
+                    return Response(record.response_body, status=record.status_code,
+                                    headers={'Idempotent-Replayed': 'true'})
+
+                response = view(request, *args, **kwargs)
+                if response.status_code >= 500:
+                    # Release the key along with anything the view wrote
+                    transaction.set_rollback(True)
+                    return response
+                record.status_code = response.status_code
+                record.response_body = response.data
+                record.save(update_fields=['status_code', 'response_body'])
+                return response
+        return wrapped
+    return decorator
@@ -0,0 +1,97 @@
+import random
+import time
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from admin_panel.models import Order
+from admin_panel.views import live_sales_series
+
+
+class Rollback(Exception):
+    pass
+
+
+def legacy_sales_series(date_from, date_to):
+    """The original per-day loop: two queries for every day in the range"""
+    series = []
+    day = date_from
+    while day <= date_to:
+        day_orders = Order.objects.filter(created_at__date=day)
+        revenue = day_orders.filter(payment_status='paid').aggregate(total=Sum('total'))['total'] or Decimal('0.00')
+        series.append({
+            'date': day.isoformat(),
+            'revenue': float(revenue),
+            'orders': day_orders.count()
+        })
+        day += timedelta(days=1)
+    return series
+
+
+class Command(BaseCommand):
+    help = 'Compare the per-day sales report loop with the single GROUP BY query'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=20000, help='Orders to seed across the last year')
+        parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (best is reported)')
+
+    def handle(self, *args, **options):
+        # Seed inside a transaction that is always rolled back, so the
+        # benchmark never leaves data behind
+        try:
+            with transaction.atomic():
+                self.seed(options['orders'])
+                self.run(options['repeat'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        self.stdout.write(f'Seeding {count} orders...')
+        rng = random.Random(42)
+        now = timezone.now()
+        orders = Order.objects.bulk_create([
+            Order(
+                customer_name='Bench', customer_email='bench@example.com', customer_phone='0',
+                order_type=rng.choice(['dine_in', 'takeaway', 'delivery']),
+                payment_status=rng.choice(['paid', 'paid', 'pending']),
+                total=Decimal(rng.randint(500, 5000)),
+            )
+            for _ in range(count)
+        ], batch_size=1000)
+        # created_at is auto_now_add, so spread the orders out afterwards
+        for order in orders:
+            order.created_at = now - timedelta(minutes=rng.randint(0, 366 * 24 * 60))
+        Order.objects.bulk_update(orders, ['created_at'], batch_size=1000)
+
+    def measure(self, func, repeat):
+        best = None
+        for _ in range(repeat):
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                result = func()
+                elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        return result, len(queries), best
+
+    def run(self, repeat):
+        today = timezone.localdate()
+        self.stdout.write(f"{'days':>5} {'legacy queries':>15} {'legacy ms':>10} {'grouped queries':>16} {'grouped ms':>11}")
+        for days in (30, 90, 365):
+            date_from = today - timedelta(days=days)
+            date_to = today - timedelta(days=1)
+            legacy, legacy_queries, legacy_time = self.measure(
+                lambda: legacy_sales_series(date_from, date_to), repeat)
+            grouped, grouped_queries, grouped_time = self.measure(
+                lambda: live_sales_series(date_from, date_to), repeat)
+            self.stdout.write(
+                f'{days:>5} {legacy_queries:>15} {legacy_time * 1000:>10.1f} '
+                f'{grouped_queries:>16} {grouped_time * 1000:>11.1f}'
+            )
+            if legacy != grouped:
+                self.stdout.write(self.style.ERROR(f'Results differ for {days} days'))
+        self.stdout.write(self.style.SUCCESS('Benchmark complete (seeded data rolled back)'))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from menu.export import write_menu_export, export_dir
+
+
+class Command(BaseCommand):
+    help = 'Export the public menu, categories and featured items as static JSON (with .gz variants)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dir',
+            help=f'Output directory (default: {export_dir()})',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write('Exporting menu...')
+
+        for path in write_menu_export(options['dir']):
+            self.stdout.write(f'  Wrote {path} ({path.stat().st_size} bytes) and {path.name}.gz')
+
+        self.stdout.write(self.style.SUCCESS('\nSuccessfully exported menu!'))
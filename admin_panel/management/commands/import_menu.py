@@ -0,0 +1,41 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from admin_panel.menu_import import MenuImportError, import_menu, parse_rows
+
+
+class Command(BaseCommand):
+    help = 'Create or update menu items in bulk from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV or JSON file (columns: id, name, description, price, category, ...)')
+        parser.add_argument('--dry-run', action='store_true', help='Validate and report changes without writing')
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        fmt = 'json' if path.suffix.lower() == '.json' else 'csv'
+        try:
+            rows = parse_rows(path.read_text(encoding='utf-8-sig'), fmt)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {path}: {e}')
+
+        self.stdout.write(f'Importing {len(rows)} menu rows...')
+        try:
+            report = import_menu(rows, dry_run=options['dry_run'])
+        except MenuImportError as e:
+            for error in e.errors:
+                self.stdout.write(self.style.ERROR(f"  Row {error['row']}: {json.dumps(error['errors'])}"))
+            raise CommandError('Invalid rows, nothing was imported')
+
+        for name in report['created']:
+            self.stdout.write(f'  Created menu item: {name}')
+        for item in report['updated']:
+            changes = ', '.join(f'{field}: {old} -> {new}' for field, (old, new) in item['changes'].items())
+            self.stdout.write(f"  Updated menu item: {item['name']} ({changes})")
+
+        summary = f"{len(report['created'])} created, {len(report['updated'])} updated, {report['unchanged']} unchanged"
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'\nDry run: {summary}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'\nSuccessfully imported menu! {summary}'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from admin_panel.models import IdempotencyKey
+
+
+class Command(BaseCommand):
+    help = 'Delete stored Idempotency-Key responses older than IDEMPOTENCY_KEY_TTL'
+
+    def handle(self, *args, **options):
+        count = IdempotencyKey.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Successfully purged {count} expired idempotency keys!'))
@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+from admin_panel.models import MenuTombstone
+
+
+class Command(BaseCommand):
+    help = 'Delete menu deletion tombstones older than MENU_TOMBSTONE_RETENTION'
+
+    def handle(self, *args, **options):
+        count = MenuTombstone.purge_expired()
+        self.stdout.write(self.style.SUCCESS(f'Successfully purged {count} expired menu tombstones!'))
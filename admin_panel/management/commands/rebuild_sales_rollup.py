@@ -0,0 +1,26 @@
+from datetime import date
+from django.core.management.base import BaseCommand, CommandError
+from admin_panel.models import DailySalesRollup, DailyItemSales
+
+
+class Command(BaseCommand):
+    help = 'Rebuild (or repair) the daily sales rollup and per-item daily counters from raw orders'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date-from', help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--date-to', help='Last day to rebuild (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        try:
+            date_from = date.fromisoformat(options['date_from']) if options['date_from'] else None
+            date_to = date.fromisoformat(options['date_to']) if options['date_to'] else None
+        except ValueError:
+            raise CommandError('Dates must be in YYYY-MM-DD format')
+
+        self.stdout.write('Rebuilding daily sales rollup...')
+        count = DailySalesRollup.rebuild(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} daily sales rows!'))
+
+        self.stdout.write('Rebuilding per-item daily counters...')
+        count = DailyItemSales.rebuild(date_from, date_to)
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} item sales rows!'))
@@ -0,0 +1,236 @@
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.validators import URLValidator
+from django.db import transaction
+from django.utils import timezone
+
+from menu.cache import bump_menu_version
+from menu.export import write_menu_export
+from menu.search import reindex_menu_items
+from .models import Category, MenuItem
+
+
+# Columns of a menu spreadsheet; category is the category slug
+IMPORT_FIELDS = [
+    'name', 'description', 'price', 'category', 'image',
+    'is_veg', 'is_available', 'is_featured', 'rating',
+]
+EXPORT_FIELDS = ['id'] + IMPORT_FIELDS
+BOOLEAN_FIELDS = ['is_veg', 'is_available', 'is_featured']
+BATCH_SIZE = 500
+
+
+class MenuImportError(Exception):
+    """Raised with per-row errors when an import does not validate"""
+
+    def __init__(self, errors):
+        super().__init__(f'{len(errors)} invalid rows')
+        self.errors = errors
+
+
+def parse_rows(content, fmt):
+    """Rows (list of dicts) from CSV text or a JSON list / {"items": [...]}"""
+    if fmt == 'json':
+        data = json.loads(content)
+        if isinstance(data, dict):
+            data = data.get('items')
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise ValueError('JSON must be a list of items or {"items": [...]}')
+        return data
+    reader = csv.DictReader(io.StringIO(content))
+    return [{key.strip(): value for key, value in row.items() if key} for row in reader]
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ('true', '1', 'yes', 'y'):
+        return True
+    if text in ('false', '0', 'no', 'n', ''):
+        return False
+    raise ValueError('Must be true or false')
+
+
+def parse_decimal(value, places, minimum, maximum):
+    try:
+        number = Decimal(str(value).strip())
+    except InvalidOperation:
+        raise ValueError('Must be a number')
+    if not number.is_finite() or number < minimum or (maximum is not None and number > maximum):
+        raise ValueError(f'Must be between {minimum} and {maximum}' if maximum is not None else f'Must be at least {minimum}')
+    return number.quantize(Decimal(1).scaleb(-places))
+
+
+def clean_row(row, categories):
+    """Return (values, errors) for one row; only columns present in the row are returned"""
+    values = {}
+    errors = {}
+    validate_url = URLValidator()
+    for field in IMPORT_FIELDS:
+        if field not in row or row[field] is None:
+            continue
+        raw = row[field]
+        try:
+            if field == 'name':
+                raw = str(raw).strip()
+                if not raw or len(raw) > 200:
+                    raise ValueError('Must be 1-200 characters')
+                values[field] = raw
+            elif field == 'price':
+                values[field] = parse_decimal(raw, 2, Decimal('0'), Decimal('99999999.99'))
+            elif field == 'rating':
+                values[field] = parse_decimal(raw, 1, Decimal('0'), Decimal('5'))
+            elif field == 'category':
+                slug = str(raw).strip()
+                if not slug:
+                    values[field] = None
+                elif slug not in categories:
+                    raise ValueError(f'Unknown category slug "{slug}"')
+                else:
+                    values[field] = categories[slug]
+            elif field == 'image':
+                raw = str(raw).strip()
+                if raw:
+                    validate_url(raw)
+                values[field] = raw or None
+            elif field in BOOLEAN_FIELDS:
+                values[field] = parse_bool(raw)
+            else:
+                values[field] = str(raw)
+        except (ValueError, ValidationError) as e:
+            errors[field] = e.messages[0] if isinstance(e, ValidationError) else str(e)
+    return values, errors
+
+
+def plan_import(rows):
+    """Validate every row and work out what would change, without writing
+
+    Items are matched by id when the row has one, otherwise by name (as
+    seed_menu does). Raises MenuImportError listing every invalid row.
+    """
+    categories = {category.slug: category for category in Category.objects.all()}
+    existing = {item.pk: item for item in MenuItem.objects.select_related('category')}
+    by_name = {}
+    for item in existing.values():
+        by_name.setdefault(item.name.lower(), []).append(item)
+
+    errors = []
+    creates = []
+    updates = []
+    seen = set()
+    for number, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append({'row': number, 'errors': {'row': 'Must be an object'}})
+            continue
+        values, row_errors = clean_row(row, categories)
+        item = None
+        pk = row.get('id')
+        if pk not in (None, ''):
+            try:
+                item = existing.get(int(pk))
+            except (TypeError, ValueError):
+                item = None
+            if item is None:
+                row_errors['id'] = f'No menu item with id {pk}'
+        elif 'name' in values:
+            matches = by_name.get(values['name'].lower(), [])
+            if len(matches) > 1:
+                row_errors['name'] = 'Several items have this name; give an id'
+            item = matches[0] if matches else None
+        else:
+            row_errors.setdefault('name', 'Required')
+
+        if item is None and not row_errors and 'price' not in values:
+            row_errors['price'] = 'Required for new items'
+        key = item.pk if item else ('new', values.get('name', '').lower())
+        if key in seen:
+            row_errors['row'] = 'Duplicate of an earlier row'
+        seen.add(key)
+
+        if row_errors:
+            errors.append({'row': number, 'errors': row_errors})
+        elif item is None:
+            creates.append(values)
+        else:
+            changes = {}
+            for field, value in values.items():
+                current = getattr(item, field)
+                if current != value:
+                    changes[field] = (current, value)
+            if changes:
+                updates.append((item, changes))
+
+    if errors:
+        raise MenuImportError(errors)
+    return creates, updates, len(rows) - len(creates) - len(updates)
+
+
+def describe(value):
+    if isinstance(value, Category):
+        return value.slug
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def import_menu(rows, dry_run=False):
+    """Validate all rows, then create and update menu items in batches
+
+    Bulk writes skip model signals, so the menu cache version, search index
+    and static export are refreshed once for the whole import instead of
+    once per row. Returns a diff report.
+    """
+    creates, updates, unchanged = plan_import(rows)
+    report = {
+        'created': [values['name'] for values in creates],
+        'updated': [
+            {
+                'id': item.pk,
+                'name': item.name,
+                'changes': {field: [describe(old), describe(new)] for field, (old, new) in changes.items()},
+            }
+            for item, changes in updates
+        ],
+        'unchanged': unchanged,
+        'dry_run': dry_run,
+    }
+    if dry_run or not (creates or updates):
+        return report
+
+    now = timezone.now()
+    with transaction.atomic():
+        created = MenuItem.objects.bulk_create(
+            [MenuItem(**{'description': '', **values}) for values in creates],
+            batch_size=BATCH_SIZE,
+        )
+        fields = {'updated_at'}
+        for item, changes in updates:
+            for field, (old, new) in changes.items():
+                setattr(item, field, new)
+            item.updated_at = now  # bulk_update does not apply auto_now
+            fields.update(changes)
+        MenuItem.objects.bulk_update([item for item, changes in updates], sorted(fields), batch_size=BATCH_SIZE)
+
+        ids = [item.pk for item in created] + [item.pk for item, changes in updates]
+        reindex_menu_items(ids)
+        transaction.on_commit(bump_menu_version)
+        if settings.MENU_EXPORT_ON_SAVE:
+            transaction.on_commit(write_menu_export)
+    return report
+
+
+def export_rows():
+    """Menu items as import-compatible rows"""
+    rows = MenuItem.objects.order_by('id').values(
+        'id', 'name', 'description', 'price', 'category__slug', 'image',
+        'is_veg', 'is_available', 'is_featured', 'rating',
+    )
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        row['category'] = row.pop('category__slug') or ''
+        yield row
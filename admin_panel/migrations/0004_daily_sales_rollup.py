@@ -0,0 +1,57 @@
+# Generated by Django 5.2.8 on 2026-10-17 15:54
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_rollup(apps, schema_editor):
+    Order = apps.get_model('admin_panel', 'Order')
+    OrderItem = apps.get_model('admin_panel', 'OrderItem')
+    DailySalesRollup = apps.get_model('admin_panel', 'DailySalesRollup')
+
+    buckets = {}
+    order_rows = Order.objects.annotate(day=TruncDate('created_at')).values('day', 'order_type').annotate(
+        count=Count('id'),
+        revenue=Sum('total', filter=Q(payment_status='paid')),
+    ).order_by()
+    for row in order_rows:
+        buckets[(row['day'], row['order_type'])] = DailySalesRollup(
+            date=row['day'], order_type=row['order_type'],
+            order_count=row['count'], paid_revenue=row['revenue'] or Decimal('0.00'),
+        )
+    item_rows = OrderItem.objects.annotate(day=TruncDate('order__created_at')).values('day', 'order__order_type').annotate(
+        quantity=Sum('quantity'),
+    ).order_by()
+    for row in item_rows:
+        bucket = buckets.get((row['day'], row['order__order_type']))
+        if bucket is not None:
+            bucket.item_quantity = row['quantity'] or 0
+    DailySalesRollup.objects.bulk_create(buckets.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailySalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('order_type', models.CharField(choices=[('dine_in', 'Dine In'), ('takeaway', 'Takeaway'), ('delivery', 'Delivery')], max_length=20)),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('paid_revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('item_quantity', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'ordering': ['date', 'order_type'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'order_type'), name='unique_daily_sales_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollup, migrations.RunPython.noop),
+    ]
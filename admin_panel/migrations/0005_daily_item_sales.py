@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-17 16:10
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+
+def backfill_item_sales(apps, schema_editor):
+    OrderItem = apps.get_model('admin_panel', 'OrderItem')
+    DailyItemSales = apps.get_model('admin_panel', 'DailyItemSales')
+
+    rows = OrderItem.objects.exclude(order__status='cancelled').exclude(menu_item=None).annotate(
+        day=TruncDate('order__created_at'),
+    ).values('day', 'menu_item_id').annotate(
+        lines=Count('id'), total_quantity=Sum('quantity'), total_revenue=Sum('subtotal'),
+    ).order_by()
+    DailyItemSales.objects.bulk_create([
+        DailyItemSales(
+            date=row['day'], menu_item_id=row['menu_item_id'], order_count=row['lines'],
+            quantity=row['total_quantity'] or 0, revenue=row['total_revenue'] or Decimal('0.00'),
+        )
+        for row in rows
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0004_daily_sales_rollup'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyItemSales',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('order_count', models.PositiveIntegerField(default=0)),
+                ('quantity', models.PositiveIntegerField(default=0)),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12)),
+                ('menu_item', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_sales', to='admin_panel.menuitem')),
+            ],
+            options={
+                'ordering': ['date', 'menu_item'],
+                'constraints': [models.UniqueConstraint(fields=('date', 'menu_item'), name='unique_daily_item_sales')],
+            },
+        ),
+        migrations.RunPython(backfill_item_sales, migrations.RunPython.noop),
+    ]
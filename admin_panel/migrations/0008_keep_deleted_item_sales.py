@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0007_order_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='dailyitemsales',
+            name='menu_item_name',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.AlterField(
+            model_name='dailyitemsales',
+            name='menu_item',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='daily_sales', to='admin_panel.menuitem'),
+        ),
+    ]
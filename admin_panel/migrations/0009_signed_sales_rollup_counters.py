@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0008_keep_deleted_item_sales'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailysalesrollup',
+            name='order_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='dailysalesrollup',
+            name='item_quantity',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-17 18:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('admin_panel', '0009_signed_sales_rollup_counters'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dailyitemsales',
+            name='order_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='dailyitemsales',
+            name='quantity',
+            field=models.IntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,11 @@
-from django.db import models
+from django.db import models, transaction, connection, IntegrityError
+from django.db.models import Q, F, Sum, Count
+from django.db.models.functions import Coalesce, TruncDate
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from datetime import datetime, time, timedelta
 from decimal import Decimal
 
 
@@ -10,7 +16,7 @@ class Category(models.Model):
     image = models.URLField(blank=True, null=True)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         verbose_name_plural = "Categories"
@@ -31,15 +37,53 @@ class MenuItem(models.Model):
     is_featured = models.BooleanField(default=False)
     rating = models.DecimalField(max_digits=3, decimal_places=1, default=4.0)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # menu_list: available items sorted by name/price/rating, id breaks ties.
+            # Partial indexes, because a bare boolean WHERE term cannot use an
+            # index prefix on SQLite.
+            models.Index(fields=['name', 'id'], condition=Q(is_available=True), name='menuitem_avail_name_idx'),
+            models.Index(fields=['price', 'id'], condition=Q(is_available=True), name='menuitem_avail_price_idx'),
+            models.Index(fields=['rating', 'id'], condition=Q(is_available=True), name='menuitem_avail_rating_idx'),
+            # menu_list filtered by category
+            models.Index(fields=['category', 'name'], condition=Q(is_available=True), name='menuitem_cat_avail_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+class MenuTombstone(models.Model):
+    KIND_CHOICES = [
+        ('item', 'Menu Item'),
+        ('category', 'Category'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ['deleted_at']
+
+    def __str__(self):
+        return f"Deleted {self.kind} #{self.object_id}"
+
+    @classmethod
+    def retention_cutoff(cls):
+        """Tombstones older than this are pruned; older cursors need a full resync"""
+        return timezone.now() - timedelta(seconds=settings.MENU_TOMBSTONE_RETENTION)
+
+    @classmethod
+    def purge_expired(cls):
+        """Delete tombstones past the retention window; returns how many were removed"""
+        deleted, _ = cls.objects.filter(deleted_at__lt=cls.retention_cutoff()).delete()
+        return deleted
+
+
 class Order(models.Model):
     STATUS_CHOICES = [
         ('pending', 'Pending'),
@@ -76,15 +120,123 @@ class Order(models.Model):
     total = models.DecimalField(max_digits=10, decimal_places=2, default=Decimal('0.00'))
     special_instructions = models.TextField(blank=True, null=True)
     stripe_payment_id = models.CharField(max_length=200, blank=True, null=True)
+    # Bumped on every status or payment change; track_order long-polls on it
+    version = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # order_list filters, newest first
+            models.Index(fields=['-created_at'], name='order_created_idx'),
+            models.Index(fields=['status', '-created_at'], name='order_status_created_idx'),
+            models.Index(fields=['payment_status', '-created_at'], name='order_payment_created_idx'),
+            models.Index(fields=['order_type', '-created_at'], name='order_type_created_idx'),
+        ]
 
     def __str__(self):
         return f"Order #{self.id} - {self.customer_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what DailySalesRollup currently counts for this order
+        if all(field in field_names for field in ('created_at', 'order_type', 'payment_status', 'total')):
+            instance._sales_state = instance.sales_state()
+        if 'created_at' in field_names and 'status' in field_names:
+            instance._item_sales_state = instance.item_sales_state()
+        if 'status' in field_names and 'payment_status' in field_names:
+            instance._tracking_state = instance.tracking_state()
+        return instance
+
+    def sales_state(self):
+        """(day, order_type, paid revenue) this order contributes to the sales rollup"""
+        revenue = Decimal(str(self.total)) if self.payment_status == 'paid' else Decimal('0.00')
+        return timezone.localdate(self.created_at), self.order_type, revenue
+
+    def stored_sales_state(self):
+        """Sales state of the row as last loaded from or written to the database"""
+        if hasattr(self, '_sales_state'):
+            return self._sales_state
+        if self.pk is None or self._state.adding:
+            return None
+        return Order.objects.get(pk=self.pk).sales_state()
+
+    def item_sales_state(self):
+        """(day, counted) for DailyItemSales; lines of cancelled orders are not counted"""
+        return timezone.localdate(self.created_at), self.status != 'cancelled'
+
+    def stored_item_sales_state(self):
+        if hasattr(self, '_item_sales_state'):
+            return self._item_sales_state
+        if self.pk is None or self._state.adding:
+            return None
+        return Order.objects.get(pk=self.pk).item_sales_state()
+
+    def tracking_state(self):
+        """What customers tracking the order see change; version moves with it"""
+        return self.status, self.payment_status
+
+    def stored_tracking_state(self):
+        if hasattr(self, '_tracking_state'):
+            return self._tracking_state
+        if self.pk is None or self._state.adding:
+            return None
+        return Order.objects.filter(pk=self.pk).values_list('status', 'payment_status').first()
+
+    def load_stored_states(self):
+        """Remember the counted states of the stored row with one query, unless known"""
+        if self.pk is None or self._state.adding:
+            return
+        if all(hasattr(self, name) for name in ('_sales_state', '_item_sales_state', '_tracking_state')):
+            return
+        stored = Order.objects.only(*COUNTED_ORDER_FIELDS).filter(pk=self.pk).first()
+        if stored is not None:
+            self._sales_state = stored._sales_state
+            self._item_sales_state = stored._item_sales_state
+            self._tracking_state = stored._tracking_state
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not COUNTED_ORDER_FIELDS.intersection(update_fields):
+            # Nothing the sales counters or order trackers see is being written
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            self.load_stored_states()
+            previous = self.stored_sales_state()
+            previous_items = self.stored_item_sales_state()
+            previous_tracking = self.stored_tracking_state()
+            bump = previous_tracking is not None and previous_tracking != self.tracking_state()
+            if bump:
+                # Increment in SQL so concurrent saves never reuse a version
+                self.version = F('version') + 1
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {*kwargs['update_fields'], 'version'}
+            super().save(*args, **kwargs)
+            if bump:
+                self.refresh_from_db(fields=['version'])
+            current = self.sales_state()
+            DailySalesRollup.record_order_change(self, previous, current)
+            current_items = self.item_sales_state()
+            if previous_items is not None and previous_items != current_items:
+                DailyItemSales.record_order_change(self, previous_items, current_items)
+        self._sales_state = current
+        self._item_sales_state = current_items
+        self._tracking_state = self.tracking_state()
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            day, order_type, revenue = self.stored_sales_state()
+            quantity = self.items.aggregate(total=Sum('quantity'))['total'] or 0
+            DailySalesRollup.add(day, order_type, orders=-1, revenue=-revenue, quantity=-quantity)
+            DailyItemSales.record_order_change(self, self.stored_item_sales_state(), None)
+            return super().delete(*args, **kwargs)
+
+
+# Order fields behind sales_state(), item_sales_state() and tracking_state()
+COUNTED_ORDER_FIELDS = {'created_at', 'order_type', 'status', 'payment_status', 'total'}
+
 
 class OrderItem(models.Model):
     order = models.ForeignKey(Order, on_delete=models.CASCADE, related_name='items')
@@ -97,9 +249,375 @@ class OrderItem(models.Model):
     def __str__(self):
         return f"{self.quantity}x {self.item_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what DailySalesRollup and DailyItemSales currently count for this line
+        if all(field in field_names for field in ('order_id', 'quantity', 'menu_item_id', 'subtotal')):
+            instance._sales_state = instance.sales_state()
+        return instance
+
+    def sales_state(self):
+        """(order_id, quantity, menu_item_id, subtotal) this line contributes to the sales counters"""
+        return self.order_id, self.quantity, self.menu_item_id, self.subtotal
+
     def save(self, *args, **kwargs):
         self.subtotal = self.item_price * self.quantity
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            previous = getattr(self, '_sales_state', None)
+            if previous is None and not self._state.adding:
+                previous = OrderItem.objects.get(pk=self.pk)._sales_state
+            super().save(*args, **kwargs)
+            current = self.sales_state()
+            if previous != current:
+                DailyItemSales.record_line_change(self.order, previous, current)
+                if previous is not None and previous[0] != current[0]:
+                    day, order_type, _ = Order.objects.get(pk=previous[0]).sales_state()
+                    DailySalesRollup.add(day, order_type, quantity=-previous[1])
+                    previous = None
+                day, order_type, _ = self.order.sales_state()
+                DailySalesRollup.add(day, order_type, quantity=current[1] - (previous[1] if previous else 0))
+        self._sales_state = current
+
+    @classmethod
+    def bulk_create_for_order(cls, order, lines):
+        """Insert the lines of a new order with one query and update the sales counters once
+
+        bulk_create skips save(), so the subtotals and counter deltas it would
+        apply are applied here. Call it in the transaction that created the order.
+        """
+        for line in lines:
+            line.order = order
+            line.subtotal = line.item_price * line.quantity
+        created = cls.objects.bulk_create(lines)
+
+        day, order_type, _ = order.sales_state()
+        DailySalesRollup.add(day, order_type, quantity=sum(line.quantity for line in created))
+        day, counted = order.item_sales_state()
+        if counted:
+            deltas = {}
+            for line in created:
+                if line.menu_item_id is not None:
+                    delta = deltas.setdefault(line.menu_item_id, [0, 0, Decimal('0.00')])
+                    delta[0] += 1
+                    delta[1] += line.quantity
+                    delta[2] += line.subtotal
+            DailyItemSales.add_many(day, deltas)
+        for line in created:
+            line._sales_state = line.sales_state()
+        return created
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            day, order_type, _ = self.order.sales_state()
+            DailySalesRollup.add(day, order_type, quantity=-self.quantity)
+            DailyItemSales.record_line_change(self.order, self.sales_state(), None)
+            return super().delete(*args, **kwargs)
+
+
+class DailySalesRollup(models.Model):
+    """Per-day, per-order-type sales totals maintained alongside Order/OrderItem writes
+
+    Order.save/delete and OrderItem.save/delete apply deltas in the same
+    transaction. Bulk queryset updates bypass them; run
+    `manage.py rebuild_sales_rollup` after those.
+    """
+    date = models.DateField()
+    order_type = models.CharField(max_length=20, choices=Order.ORDER_TYPE_CHOICES)
+    # Signed: deltas may briefly push a bucket below zero until a rebuild
+    order_count = models.IntegerField(default=0)
+    paid_revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+    item_quantity = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ['date', 'order_type']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'order_type'], name='unique_daily_sales_rollup'),
+        ]
+
+    def __str__(self):
+        return f"Sales on {self.date} ({self.order_type})"
+
+    @classmethod
+    def add(cls, day, order_type, orders=0, revenue=Decimal('0.00'), quantity=0):
+        """Apply deltas to one day/order type bucket, creating it if needed"""
+        if not (orders or revenue or quantity):
+            return
+        changes = {
+            'order_count': F('order_count') + orders,
+            'paid_revenue': F('paid_revenue') + revenue,
+            'item_quantity': F('item_quantity') + quantity,
+        }
+        bucket = cls.objects.filter(date=day, order_type=order_type)
+        if bucket.update(**changes):
+            return
+        if orders < 0 or revenue < 0 or quantity < 0:
+            # Nothing recorded for this bucket yet; a rebuild will repair it
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    date=day, order_type=order_type, order_count=orders,
+                    paid_revenue=revenue, item_quantity=quantity
+                )
+        except IntegrityError:
+            # Another transaction created the bucket first
+            bucket.update(**changes)
+
+    @classmethod
+    def record_order_change(cls, order, previous, current):
+        """Move an order's contribution from its previous to its current sales state"""
+        if previous == current:
+            return
+        if previous is not None and previous[:2] == current[:2]:
+            cls.add(*current[:2], revenue=current[2] - previous[2])
+            return
+        # New order, or it moved to another day/order type bucket with its items
+        quantity = 0
+        if previous is not None:
+            quantity = order.items.aggregate(total=Sum('quantity'))['total'] or 0
+            cls.add(*previous[:2], orders=-1, revenue=-previous[2], quantity=-quantity)
+        cls.add(*current[:2], orders=1, revenue=current[2], quantity=quantity)
+
+    @classmethod
+    def record_revenue_change(cls, orders, sign):
+        """Add (sign=1) or remove (sign=-1) the totals of orders as paid revenue
+
+        For queryset.update() calls that flip payment_status and so bypass
+        Order.save(). Call it inside the same transaction as the update.
+        """
+        rows = orders.annotate(day=TruncDate('created_at')).values('day', 'order_type').annotate(
+            revenue=Sum('total'),
+        ).order_by()
+        for row in rows:
+            cls.add(row['day'], row['order_type'], revenue=sign * (row['revenue'] or Decimal('0.00')))
+
+    @classmethod
+    def rebuild(cls, date_from=None, date_to=None):
+        """Recompute buckets from raw orders for an inclusive date range (all dates by default)"""
+        orders = Order.objects.all()
+        items = OrderItem.objects.all()
+        rollups = cls.objects.all()
+        if date_from:
+            start = timezone.make_aware(datetime.combine(date_from, time.min))
+            orders = orders.filter(created_at__gte=start)
+            items = items.filter(order__created_at__gte=start)
+            rollups = rollups.filter(date__gte=date_from)
+        if date_to:
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+            orders = orders.filter(created_at__lt=end)
+            items = items.filter(order__created_at__lt=end)
+            rollups = rollups.filter(date__lte=date_to)
+
+        buckets = {}
+        order_rows = orders.annotate(day=TruncDate('created_at')).values('day', 'order_type').annotate(
+            count=Count('id'),
+            revenue=Sum('total', filter=Q(payment_status='paid')),
+        ).order_by()
+        for row in order_rows:
+            buckets[(row['day'], row['order_type'])] = cls(
+                date=row['day'], order_type=row['order_type'],
+                order_count=row['count'], paid_revenue=row['revenue'] or Decimal('0.00'),
+            )
+        item_rows = items.annotate(day=TruncDate('order__created_at')).values('day', 'order__order_type').annotate(
+            quantity=Sum('quantity'),
+        ).order_by()
+        for row in item_rows:
+            bucket = buckets.get((row['day'], row['order__order_type']))
+            if bucket is not None:
+                bucket.item_quantity = row['quantity'] or 0
+
+        with transaction.atomic():
+            rollups.delete()
+            cls.objects.bulk_create(buckets.values(), batch_size=500)
+        return len(buckets)
+
+
+class DailyItemSales(models.Model):
+    """Per-day, per-menu-item quantity and revenue of orders that are not cancelled
+
+    Kept up to date by Order and OrderItem writes like DailySalesRollup;
+    `manage.py rebuild_sales_rollup` rebuilds both. Deleting a menu item
+    keeps its counters, detached and labelled with menu_item_name.
+    """
+    date = models.DateField()
+    menu_item = models.ForeignKey(MenuItem, on_delete=models.SET_NULL, null=True, related_name='daily_sales')
+    # Filled in when the menu item is deleted, see admin_panel/signals.py
+    menu_item_name = models.CharField(max_length=200, blank=True, default='')
+    # Signed like DailySalesRollup's counters, since they take negative deltas
+    order_count = models.IntegerField(default=0)
+    quantity = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=12, decimal_places=2, default=Decimal('0.00'))
+
+    class Meta:
+        ordering = ['date', 'menu_item']
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'menu_item'], name='unique_daily_item_sales'),
+        ]
+
+    def __str__(self):
+        return f"Sales of item #{self.menu_item_id} on {self.date}"
+
+    @classmethod
+    def add(cls, day, menu_item_id, orders=0, quantity=0, revenue=Decimal('0.00')):
+        """Apply deltas to one day/menu item counter, creating it if needed"""
+        if not (orders or quantity or revenue):
+            return
+        changes = {
+            'order_count': F('order_count') + orders,
+            'quantity': F('quantity') + quantity,
+            'revenue': F('revenue') + revenue,
+        }
+        counter = cls.objects.filter(date=day, menu_item_id=menu_item_id)
+        if counter.update(**changes):
+            return
+        if orders < 0 or quantity < 0 or revenue < 0:
+            # Nothing recorded for this counter yet; a rebuild will repair it
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    date=day, menu_item_id=menu_item_id, order_count=orders,
+                    quantity=quantity, revenue=revenue
+                )
+        except IntegrityError:
+            # Another transaction created the counter first
+            counter.update(**changes)
+
+    @classmethod
+    def add_many(cls, day, deltas):
+        """Apply positive {menu_item_id: (orders, quantity, revenue)} increments for one day
+
+        On SQLite and PostgreSQL this is a single INSERT ... ON CONFLICT DO
+        UPDATE that adds to existing counters; the ORM's update_conflicts
+        can only overwrite columns, not increment them.
+        """
+        if not deltas:
+            return
+        if connection.vendor not in ('sqlite', 'postgresql'):
+            for menu_item_id, delta in deltas.items():
+                cls.add(day, menu_item_id, *delta)
+            return
+
+        ops = connection.ops
+        revenue_field = cls._meta.get_field('revenue')
+        table = ops.quote_name(cls._meta.db_table)
+        params = []
+        for menu_item_id in sorted(deltas):  # fixed order so concurrent upserts lock rows alike
+            orders, quantity, revenue = deltas[menu_item_id]
+            params += [
+                ops.adapt_datefield_value(day), menu_item_id, '', orders, quantity,
+                ops.adapt_decimalfield_value(revenue, revenue_field.max_digits, revenue_field.decimal_places),
+            ]
+        rows = ', '.join(['(%s, %s, %s, %s, %s, %s)'] * len(deltas))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {table} (date, menu_item_id, menu_item_name, order_count, quantity, revenue) VALUES {rows} '
+                f'ON CONFLICT (date, menu_item_id) DO UPDATE SET '
+                f'order_count = {table}.order_count + excluded.order_count, '
+                f'quantity = {table}.quantity + excluded.quantity, '
+                f'revenue = {table}.revenue + excluded.revenue',
+                params,
+            )
+
+    @classmethod
+    def record_line_change(cls, order, previous, current):
+        """Move one order line between counters; states come from OrderItem.sales_state()"""
+        deltas = {}
+        for state, sign in ((previous, -1), (current, 1)):
+            if state is None or state[2] is None:
+                continue
+            order_id, quantity, menu_item_id, subtotal = state
+            line_order = order if order.pk == order_id else Order.objects.get(pk=order_id)
+            day, counted = line_order.item_sales_state()
+            if counted:
+                delta = deltas.setdefault((day, menu_item_id), [0, 0, Decimal('0.00')])
+                delta[0] += sign
+                delta[1] += sign * quantity
+                delta[2] += sign * Decimal(str(subtotal))
+        for (day, menu_item_id), (orders, quantity, revenue) in deltas.items():
+            cls.add(day, menu_item_id, orders=orders, quantity=quantity, revenue=revenue)
+
+    @classmethod
+    def record_order_change(cls, order, previous, current):
+        """Move all lines of an order between its previous and current Order.item_sales_state()"""
+        lines = order.items.exclude(menu_item=None).values('menu_item_id').annotate(
+            lines=Count('id'), total_quantity=Sum('quantity'), total_revenue=Sum('subtotal'),
+        ).order_by()
+        for state, sign in ((previous, -1), (current, 1)):
+            if state is None or not state[1]:
+                continue
+            for line in lines:
+                cls.add(
+                    state[0], line['menu_item_id'], orders=sign * line['lines'],
+                    quantity=sign * line['total_quantity'], revenue=sign * line['total_revenue']
+                )
+
+    @classmethod
+    def record_orders_change(cls, orders, sign):
+        """Add (sign=1) or remove (sign=-1) all lines of orders, e.g. around a bulk cancel
+
+        For queryset.update() calls that change status and so bypass
+        Order.save(). Call it inside the same transaction as the update.
+        """
+        rows = OrderItem.objects.filter(order__in=orders).exclude(menu_item=None).annotate(
+            day=TruncDate('order__created_at'),
+        ).values('day', 'menu_item_id').annotate(
+            lines=Count('id'), total_quantity=Sum('quantity'), total_revenue=Sum('subtotal'),
+        ).order_by()
+        for row in rows:
+            cls.add(
+                row['day'], row['menu_item_id'], orders=sign * row['lines'],
+                quantity=sign * row['total_quantity'], revenue=sign * row['total_revenue']
+            )
+
+    @classmethod
+    def rebuild(cls, date_from=None, date_to=None):
+        """Recompute counters from raw order lines for an inclusive date range (all dates by default)"""
+        items = OrderItem.objects.exclude(order__status='cancelled')
+        counters = cls.objects.all()
+        if date_from:
+            items = items.filter(order__created_at__gte=timezone.make_aware(datetime.combine(date_from, time.min)))
+            counters = counters.filter(date__gte=date_from)
+        if date_to:
+            end = timezone.make_aware(datetime.combine(date_to + timedelta(days=1), time.min))
+            items = items.filter(order__created_at__lt=end)
+            counters = counters.filter(date__lte=date_to)
+
+        totals = {'lines': Count('id'), 'total_quantity': Sum('quantity'), 'total_revenue': Sum('subtotal')}
+        items = items.annotate(day=TruncDate('order__created_at'))
+        rows = items.exclude(menu_item=None).values('day', 'menu_item_id').annotate(**totals).order_by()
+        # Lines of deleted menu items are kept as detached counters, one per name
+        detached = items.filter(menu_item=None).values('day', 'item_name').annotate(**totals).order_by()
+        rebuilt = [
+            cls(
+                date=row['day'], menu_item_id=row.get('menu_item_id'), menu_item_name=row.get('item_name', ''),
+                order_count=row['lines'], quantity=row['total_quantity'] or 0,
+                revenue=row['total_revenue'] or Decimal('0.00'),
+            )
+            for row in [*rows, *detached]
+        ]
+        with transaction.atomic():
+            counters.delete()
+            cls.objects.bulk_create(rebuilt, batch_size=500)
+        return len(rebuilt)
+
+    @classmethod
+    def top_items(cls, window='all', limit=10):
+        """Top menu items by quantity over the last 1, 7 or 30 days (including today) or all time"""
+        counters = cls.objects.all()
+        if window != 'all':
+            days = POPULAR_WINDOWS[window]
+            counters = counters.filter(date__gte=timezone.localdate() - timedelta(days=days - 1))
+        return counters.values('menu_item', item_name=Coalesce('menu_item__name', 'menu_item_name')).annotate(
+            total_orders=Sum('order_count'),
+            total_quantity=Sum('quantity'),
+            total_revenue=Sum('revenue'),
+        ).order_by('-total_quantity', 'menu_item')[:limit]
+
+
+# ?window= values accepted by the popular items reports, in days
+POPULAR_WINDOWS = {'1d': 1, '7d': 7, '30d': 30, 'all': None}
 
 
 class Reservation(models.Model):
@@ -126,6 +644,43 @@ class Reservation(models.Model):
 
     class Meta:
         ordering = ['-date', '-time']
+        indexes = [
+            # reservation_list filters, latest slot first
+            models.Index(fields=['-date', '-time'], name='reservation_date_time_idx'),
+            models.Index(fields=['status', '-date', '-time'], name='reservation_status_date_idx'),
+        ]
 
     def __str__(self):
         return f"Reservation for {self.customer_name} on {self.date}"
+
+
+class IdempotencyKey(models.Model):
+    """Response stored for a POST sent with an Idempotency-Key header
+
+    See admin_panel/idempotency.py. Rows older than IDEMPOTENCY_KEY_TTL are
+    ignored and removed by `manage.py purge_idempotency_keys`.
+    """
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True, blank=True)
+    response_body = models.JSONField(encoder=DjangoJSONEncoder, null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='unique_idempotency_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.key}"
+
+    @classmethod
+    def expiry_cutoff(cls):
+        return timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+
+    @classmethod
+    def purge_expired(cls):
+        """Delete keys past their TTL; returns how many were removed"""
+        deleted, _ = cls.objects.filter(created_at__lt=cls.expiry_cutoff()).delete()
+        return deleted
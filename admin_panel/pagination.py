@@ -0,0 +1,129 @@
+import base64
+import binascii
+import json
+import math
+from datetime import date, datetime, time
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 100
+
+
+def wants_page(params):
+    """Paginated envelopes are opt-in so existing callers keep getting plain lists"""
+    return any(key in params for key in ('page', 'page_size', 'cursor'))
+
+
+def parse_ordering(params, orderings, default):
+    """Return (columns, descending) for ?ordering=name or -name
+
+    orderings maps each public name to the model fields it sorts by; id is
+    always appended as a tie-breaker so rows never repeat across pages.
+    Raises ValueError when the name is not whitelisted.
+    """
+    ordering = params.get('ordering') or default
+    name = ordering.lstrip('-')
+    if name not in orderings:
+        raise ValueError(f"ordering must be one of: {', '.join(sorted(orderings))} (prefix with - for descending)")
+    columns = [column for column in orderings[name] if column != 'id'] + ['id']
+    return columns, ordering.startswith('-')
+
+
+def seek_after(columns, values, descending):
+    """Rows strictly after values in (columns) order, as a Q for keyset pagination"""
+    lookup = 'lt' if descending else 'gt'
+    condition = Q()
+    for index, column in enumerate(columns):
+        equal = {columns[i]: values[i] for i in range(index)}
+        condition |= Q(**equal, **{f'{column}__{lookup}': values[index]})
+    return condition
+
+
+def parse_int(params, name, default):
+    try:
+        return int(params.get(name, default))
+    except (TypeError, ValueError):
+        raise ValueError(f'{name} must be an integer')
+
+
+def parse_page_size(params):
+    page_size = parse_int(params, 'page_size', DEFAULT_PAGE_SIZE)
+    if page_size < 1:
+        raise ValueError('page_size must be positive')
+    return min(page_size, MAX_PAGE_SIZE)
+
+
+def encode_cursor(values):
+    # isoformat() keeps microseconds, which DjangoJSONEncoder rounds to milliseconds
+    values = [value.isoformat() if isinstance(value, (datetime, date, time)) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(values, cls=DjangoJSONEncoder).encode()).decode()
+
+
+def decode_cursor(cursor, columns):
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, ValueError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != len(columns):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def paginate(queryset, params, serializer_class, orderings, default_ordering):
+    """Order a queryset and, when asked for, cut it into a page
+
+    Returns (data, None) on success or (None, message) for bad parameters.
+    Without page/page_size/cursor the whole list is returned as before.
+    ?page=N gives numbered pages with a total count; ?cursor= (empty for the
+    first page) switches to keyset pagination, which stays fast on deep
+    pages because it seeks past the last row instead of using OFFSET.
+    Keyset pages only carry a count on the first page or with ?count=true;
+    elsewhere count is null so deep pages never scan the whole list.
+    """
+    try:
+        if not wants_page(params) and not params.get('ordering'):
+            return serializer_class(queryset, many=True).data, None
+        columns, descending = parse_ordering(params, orderings, default_ordering)
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(*[prefix + column for column in columns])
+        if not wants_page(params):
+            return serializer_class(queryset, many=True).data, None
+        page_size = parse_page_size(params)
+
+        if 'cursor' in params:
+            wants_count = not params['cursor'] or params.get('count', '').lower() == 'true'
+            count = queryset.count() if wants_count else None
+            if params['cursor']:
+                queryset = queryset.filter(seek_after(columns, decode_cursor(params['cursor'], columns), descending))
+            rows = list(queryset[:page_size + 1])
+            next_cursor = None
+            if len(rows) > page_size:
+                rows = rows[:page_size]
+                next_cursor = encode_cursor([getattr(rows[-1], column) for column in columns])
+            return {
+                'count': count,
+                'page_size': page_size,
+                'ordering': params.get('ordering') or default_ordering,
+                'next_cursor': next_cursor,
+                'results': serializer_class(rows, many=True).data,
+            }, None
+
+        page = parse_int(params, 'page', 1)
+        if page < 1:
+            raise ValueError('page must be positive')
+        count = queryset.count()
+    except ValueError as e:
+        return None, str(e)
+
+    offset = (page - 1) * page_size
+    return {
+        'count': count,
+        'page': page,
+        'page_size': page_size,
+        'num_pages': max(1, math.ceil(count / page_size)),
+        'ordering': params.get('ordering') or default_ordering,
+        'results': serializer_class(queryset[offset:offset + page_size], many=True).data,
+    }, None
@@ -1,7 +1,6 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from .models import Category, MenuItem, Order, OrderItem, Reservation
-from accounts.models import UserProfile
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,12 +13,17 @@ class UserSerializer(serializers.ModelSerializer):
                   'is_active', 'is_staff', 'is_superuser', 'date_joined', 
                   'last_login', 'phone', 'address']
 
+    def get_profile(self, obj):
+        # Lists load the profile with select_related('profile'); a user
+        # without one raises RelatedObjectDoesNotExist, an AttributeError
+        return getattr(obj, 'profile', None)
+
     def get_phone(self, obj):
-        profile = UserProfile.objects.filter(user=obj).first()
+        profile = self.get_profile(obj)
         return profile.phone if profile else ''
 
     def get_address(self, obj):
-        profile = UserProfile.objects.filter(user=obj).first()
+        profile = self.get_profile(obj)
         return profile.address if profile else ''
 
 
@@ -31,6 +35,9 @@ class CategorySerializer(serializers.ModelSerializer):
         fields = '__all__'
 
     def get_item_count(self, obj):
+        # Lists annotate item_count=Count('items') instead of counting per row
+        if hasattr(obj, 'item_count'):
+            return obj.item_count
         return obj.items.count()
 
 
@@ -58,6 +65,7 @@ class OrderSerializer(serializers.ModelSerializer):
     class Meta:
         model = Order
         fields = '__all__'
+        read_only_fields = ['version']
 
     def get_user_email(self, obj):
         return obj.user.email if obj.user else None
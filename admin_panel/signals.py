@@ -0,0 +1,9 @@
+from django.db.models.signals import pre_delete
+from django.dispatch import receiver
+from .models import MenuItem, DailyItemSales
+
+
+@receiver(pre_delete, sender=MenuItem)
+def keep_item_sales_history(sender, instance, **kwargs):
+    """Label the item's sales counters before deletion detaches them"""
+    DailyItemSales.objects.filter(menu_item=instance).update(menu_item_name=instance.name)
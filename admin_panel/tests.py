@@ -1,3 +1,288 @@
+import random
+from datetime import date, time, timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import connection
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import UserProfile
+from menu.search import search_menu_items
+from .models import Category, DailyItemSales, MenuItem, Order, OrderItem, Reservation
+
+
+class HotPathIndexTests(TestCase):
+    """The list endpoints' query shapes should be served by the composite indexes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        rng = random.Random(42)
+        now = timezone.now()
+
+        categories = Category.objects.bulk_create(
+            Category(name=f'Category {i}', slug=f'category-{i}') for i in range(20)
+        )
+        MenuItem.objects.bulk_create(
+            MenuItem(
+                name=f'Item {i}',
+                description='Seeded item',
+                price=Decimal(rng.randint(50, 900)),
+                category=rng.choice(categories),
+                is_available=rng.random() < 0.9,
+                rating=Decimal(rng.randint(30, 50)) / 10,
+            )
+            for i in range(5000)
+        )
+
+        orders = Order.objects.bulk_create(
+            Order(
+                customer_name=f'Customer {i}',
+                customer_email=f'customer{i}@example.com',
+                customer_phone='0300',
+                order_type=rng.choice(['dine_in', 'takeaway', 'delivery']),
+                status=rng.choice(['pending', 'confirmed', 'preparing', 'ready', 'delivered', 'cancelled']),
+                payment_status=rng.choice(['pending', 'paid', 'failed', 'refunded']),
+                total=Decimal('100.00'),
+            )
+            for i in range(20000)
+        )
+        # auto_now_add ignores explicit values, so spread created_at afterwards
+        for order in orders:
+            order.created_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 365))
+        Order.objects.bulk_update(orders, ['created_at'], batch_size=1000)
+
+        Reservation.objects.bulk_create(
+            Reservation(
+                customer_name=f'Guest {i}',
+                customer_email=f'guest{i}@example.com',
+                customer_phone='0300',
+                date=date.today() + timedelta(days=rng.randint(-365, 60)),
+                time=time(rng.randint(11, 22), rng.choice([0, 30])),
+                party_size=rng.randint(1, 8),
+                status=rng.choice(['pending', 'confirmed', 'cancelled', 'completed', 'no_show']),
+            )
+            for i in range(10000)
+        )
+
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan, f'{index_name} not used:\n{plan}')
+
+    def test_order_list_filters(self):
+        self.assertUsesIndex(Order.objects.all()[:50], 'order_created_idx')
+        self.assertUsesIndex(Order.objects.filter(status='pending')[:50], 'order_status_created_idx')
+        self.assertUsesIndex(Order.objects.filter(payment_status='paid')[:50], 'order_payment_created_idx')
+        self.assertUsesIndex(Order.objects.filter(order_type='delivery')[:50], 'order_type_created_idx')
+
+    def test_order_list_date_range(self):
+        since = timezone.now() - timedelta(days=3)
+        self.assertUsesIndex(Order.objects.filter(created_at__gte=since), 'order_created_idx')
+
+    def test_reservation_list_filters(self):
+        self.assertUsesIndex(Reservation.objects.all()[:50], 'reservation_date_time_idx')
+        self.assertUsesIndex(Reservation.objects.filter(status='pending')[:50], 'reservation_status_date_idx')
+
+    def test_menu_list_sorts(self):
+        available = MenuItem.objects.filter(is_available=True)
+        self.assertUsesIndex(available.order_by('name', 'id')[:20], 'menuitem_avail_name_idx')
+        self.assertUsesIndex(available.order_by('price', 'id')[:20], 'menuitem_avail_price_idx')
+        self.assertUsesIndex(available.order_by('-rating', '-id')[:20], 'menuitem_avail_rating_idx')
+
+    def test_menu_list_category_filter(self):
+        category = Category.objects.first()
+        queryset = MenuItem.objects.filter(is_available=True, category=category).order_by('name')
+        self.assertUsesIndex(queryset, 'menuitem_cat_avail_idx')
+
+
+class AdminListQueryCountTests(TestCase):
+    """Admin list endpoints run a fixed number of queries however many rows they return"""
+
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.category = Category.objects.create(name='Mains', slug='mains')
+
+    def add_rows(self, count):
+        for _ in range(count):
+            n = User.objects.count()
+            user = User.objects.create(username=f'user{n}', email=f'user{n}@example.com')
+            UserProfile.objects.filter(user=user).update(phone='0300', address='Street')
+            item = MenuItem.objects.create(
+                name=f'Item {n}', description='Item', price=Decimal('100.00'), category=self.category
+            )
+            order = Order.objects.create(
+                user=user, customer_name='Customer', customer_email='c@example.com', customer_phone='0300'
+            )
+            OrderItem.objects.create(order=order, menu_item=item, item_name=item.name, item_price=item.price, quantity=2)
+            Reservation.objects.create(
+                user=user, customer_name='Guest', customer_email='g@example.com', customer_phone='0300',
+                date=date.today(), time=time(19, 0), party_size=2,
+            )
+            Category.objects.create(name=f'Category {n}', slug=f'category-{n}')
+
+    def assertConstantQueries(self, url, expected):
+        self.add_rows(2)
+        with self.assertNumQueries(expected):
+            first = self.client.get(url)
+        self.add_rows(5)
+        with self.assertNumQueries(expected):
+            second = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(second.status_code, 200)
+
+    def test_category_list(self):
+        self.assertConstantQueries('/api/admin-panel/categories/', 1)
+
+    def test_menu_item_list(self):
+        self.assertConstantQueries('/api/admin-panel/menu/', 1)
+
+    def test_order_list(self):
+        self.assertConstantQueries('/api/admin-panel/orders/', 2)
+
+    def test_order_list_page(self):
+        self.assertConstantQueries('/api/admin-panel/orders/?page=1&page_size=50', 3)
+
+    def test_reservation_list(self):
+        self.assertConstantQueries('/api/admin-panel/reservations/', 1)
+
+    def test_user_list(self):
+        self.assertConstantQueries('/api/admin-panel/users/', 1)
+
+    def test_user_list_page(self):
+        self.assertConstantQueries('/api/admin-panel/users/?cursor=&page_size=50', 2)
+
+    def test_deep_keyset_pages_skip_the_count(self):
+        self.add_rows(3)
+        first = self.client.get('/api/admin-panel/users/?cursor=&page_size=2').json()
+        self.assertIsNotNone(first['count'])
+        with self.assertNumQueries(1):
+            second = self.client.get(f"/api/admin-panel/users/?cursor={first['next_cursor']}&page_size=2").json()
+        self.assertIsNone(second['count'])
+        counted = self.client.get(f"/api/admin-panel/users/?cursor={first['next_cursor']}&page_size=2&count=true").json()
+        self.assertEqual(counted['count'], first['count'])
+
+    def test_non_integer_page_is_a_clear_error(self):
+        for query, message in (('page=two', 'page must be an integer'), ('page_size=x', 'page_size must be an integer')):
+            response = self.client.get(f'/api/admin-panel/orders/?{query}')
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['error'], message)
+
+
+class DeletedItemSalesTests(TestCase):
+    """Deleting a menu item keeps its sales in the popular items report"""
+
+    def setUp(self):
+        self.item = MenuItem.objects.create(name='Burger', description='Burger', price=Decimal('500.00'))
+        order = Order.objects.create(customer_name='Ali', customer_email='ali@example.com', customer_phone='0300')
+        OrderItem.objects.create(order=order, menu_item=self.item, item_name='Burger', item_price=self.item.price, quantity=3)
+
+    def test_history_survives_item_deletion(self):
+        before = list(DailyItemSales.top_items())
+        self.item.delete()
+        after = list(DailyItemSales.top_items())
+        self.assertEqual(after[0]['item_name'], 'Burger')
+        self.assertEqual(after[0]['total_quantity'], before[0]['total_quantity'])
+        self.assertIsNone(after[0]['menu_item'])
+
+    def test_bulk_created_lines_add_to_the_counters(self):
+        for _ in range(2):  # the first order inserts a counter, the second adds to it
+            order = Order.objects.create(customer_name='Ali', customer_email='ali@example.com', customer_phone='0300')
+            OrderItem.bulk_create_for_order(order, [
+                OrderItem(menu_item=self.item, item_name='Burger', item_price=self.item.price, quantity=2),
+            ])
+        counter = DailyItemSales.objects.get(menu_item=self.item)
+        self.assertEqual((counter.order_count, counter.quantity, counter.menu_item_name), (3, 7, ''))
+
+    def test_rebuild_keeps_deleted_items(self):
+        self.item.delete()
+        DailyItemSales.rebuild()
+        self.assertEqual(
+            [(row['item_name'], row['total_quantity']) for row in DailyItemSales.top_items()],
+            [('Burger', 3)],
+        )
+
+
+class MenuImportTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_import_creates_updates_and_reports_a_diff(self):
+        mains = Category.objects.create(name='Mains', slug='mains')
+        burger = MenuItem.objects.create(name='Burger', description='Beef', price=Decimal('500.00'), category=mains)
+        tea = MenuItem.objects.create(name='Tea', description='Hot', price=Decimal('100.00'))
+        fries = MenuItem.objects.create(name='Fries', description='Salted', price=Decimal('200.00'))
+        stamps = dict(MenuItem.objects.values_list('id', 'updated_at'))
+
+        rows = [
+            {'name': 'Lassi', 'price': '250', 'category': 'mains'},
+            {'id': burger.id, 'name': 'Smash Burger', 'price': '550.00'},
+            {'name': 'Tea', 'price': '120', 'is_veg': 'true'},
+            {'id': fries.id, 'price': '200.00'},
+        ]
+        with mock.patch('admin_panel.menu_import.bump_menu_version') as bump:
+            with self.captureOnCommitCallbacks(execute=True):
+                response = self.client.post('/api/admin-panel/menu/import/', {'items': rows}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(bump.call_count, 1)
+
+        report = response.json()
+        self.assertEqual(report['created'], ['Lassi'])
+        self.assertEqual(report['unchanged'], 1)
+        self.assertEqual({item['id']: item['changes'] for item in report['updated']}, {
+            burger.id: {'name': ['Burger', 'Smash Burger'], 'price': ['500.00', '550.00']},
+            tea.id: {'price': ['100.00', '120.00'], 'is_veg': [False, True]},
+        })
+
+        burger.refresh_from_db()
+        tea.refresh_from_db()
+        fries.refresh_from_db()
+        self.assertEqual((burger.name, burger.price, tea.price, tea.is_veg), ('Smash Burger', Decimal('550.00'), Decimal('120.00'), True))
+        self.assertGreater(burger.updated_at, stamps[burger.id])
+        self.assertGreater(tea.updated_at, stamps[tea.id])
+        self.assertEqual(fries.updated_at, stamps[fries.id])
+        self.assertEqual(MenuItem.objects.get(name='Lassi').category, mains)
+
+        def search(query):
+            return list(search_menu_items(MenuItem.objects.all(), query).values_list('name', flat=True))
+        self.assertEqual(search('smash'), ['Smash Burger'])
+        self.assertEqual(search('lassi'), ['Lassi'])
+
+    def test_non_object_rows_are_row_errors(self):
+        response = self.client.post('/api/admin-panel/menu/import/', {
+            'items': [1, [2], {'name': 'Tea', 'price': '100'}],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([row['row'] for row in response.json()['rows']], [1, 2])
+        self.assertFalse(MenuItem.objects.exists())
+
+    def test_body_must_hold_an_items_list(self):
+        response = self.client.post('/api/admin-panel/menu/import/', [{'name': 'Tea'}], format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class OrderSaveQueryTests(TestCase):
+    """Order.save only reads the stored row when a counted field is written"""
+
+    def setUp(self):
+        Order.objects.create(customer_name='Ali', customer_email='ali@example.com', customer_phone='0300')
+
+    def test_uncounted_update_fields_skip_the_read(self):
+        order = Order.objects.get()
+        order.special_instructions = 'Extra napkins'
+        with self.assertNumQueries(1):
+            order.save(update_fields=['special_instructions'])
 
-# Create your tests here.
+    def test_partially_loaded_order_still_bumps_version(self):
+        order = Order.objects.only('id', 'status').get()
+        order.status = 'confirmed'
+        order.save(update_fields=['status'])
+        self.assertEqual(Order.objects.get().version, 2)
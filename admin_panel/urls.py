@@ -16,15 +16,19 @@ urlpatterns = [
     
     # Menu Items
     path('menu/', views.menu_item_list, name='menu-item-list'),
+    path('menu/import/', views.import_menu_items, name='menu-item-import'),
+    path('menu/export/', views.export_menu_items, name='menu-item-export'),
     path('menu/<int:pk>/', views.menu_item_detail, name='menu-item-detail'),
     
     # Orders
     path('orders/', views.order_list, name='order-list'),
+    path('orders/bulk-status/', views.bulk_update_order_status, name='order-bulk-status'),
     path('orders/<int:pk>/', views.order_detail, name='order-detail'),
     path('orders/<int:pk>/status/', views.update_order_status, name='order-status'),
     
     # Reservations
     path('reservations/', views.reservation_list, name='reservation-list'),
+    path('reservations/bulk-update/', views.bulk_update_reservations, name='reservation-bulk-update'),
     path('reservations/<int:pk>/', views.reservation_detail, name='reservation-detail'),
     path('reservations/<int:pk>/status/', views.update_reservation_status, name='reservation-status'),
     
@@ -35,5 +39,11 @@ urlpatterns = [
     
     # Reports
     path('reports/sales/', views.sales_report, name='sales-report'),
+    path('reports/heatmap/', views.demand_heatmap, name='demand-heatmap'),
     path('reports/popular-items/', views.popular_items, name='popular-items'),
+
+    # Exports
+    path('export/orders/', views.export_orders, name='export-orders'),
+    path('export/order-items/', views.export_order_items, name='export-order-items'),
+    path('export/reservations/', views.export_reservations, name='export-reservations'),
 ]
@@ -5,17 +5,36 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from django.contrib.auth import authenticate
 from django.contrib.auth.models import User
 from rest_framework.authtoken.models import Token
-from django.db.models import Sum, Count, Q
+from django.db import transaction
+from django.db.models import Sum, Count, Q, F, Case, When, Value
+from django.db.models.functions import TruncDate, TruncHour, TruncWeek, TruncMonth, ExtractWeekDay, ExtractHour
 from django.utils import timezone
-from datetime import timedelta
+from django.core.cache import cache
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+import csv
+import json
+from datetime import datetime, date, time, timedelta
+from functools import partial
+from itertools import islice
+from zoneinfo import ZoneInfo
 from decimal import Decimal
 
-from .models import Category, MenuItem, Order, OrderItem, Reservation
+from .models import (
+    Category, MenuItem, Order, OrderItem, Reservation, DailySalesRollup, DailyItemSales, POPULAR_WINDOWS,
+)
+from .menu_import import (
+    MenuImportError, import_menu, parse_rows as parse_menu_rows,
+    export_rows as menu_export_rows, EXPORT_FIELDS as MENU_EXPORT_FIELDS,
+)
+from .pagination import paginate
 from .serializers import (
     UserSerializer, CategorySerializer, MenuItemSerializer,
     OrderSerializer, ReservationSerializer
 )
 from accounts.models import UserProfile
+from orders.events import publish_orders
 
 
 def get_data(request):
@@ -30,6 +49,108 @@ def is_admin(user):
     return user.is_staff or user.is_superuser
 
 
+def start_of_day(day):
+    """Timezone-aware midnight of a date
+
+    Filtering created_at against day boundaries (instead of created_at__date)
+    keeps the lookup sargable so the created_at indexes can be used.
+    """
+    return timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+
+def filter_created_between(queryset, date_from=None, date_to=None):
+    """Filter created_at to whole days from date_from to date_to (YYYY-MM-DD, inclusive)
+
+    Raises ValueError on a malformed date.
+    """
+    if date_from:
+        queryset = queryset.filter(created_at__gte=start_of_day(date.fromisoformat(date_from)))
+    if date_to:
+        queryset = queryset.filter(created_at__lt=start_of_day(date.fromisoformat(date_to) + timedelta(days=1)))
+    return queryset
+
+
+# Sortable columns of the admin lists: ?ordering=<name> or -<name>.
+# Only non-null columns, so keyset cursors can always seek past a row.
+ORDER_ORDERINGS = {
+    'id': ['id'],
+    'created_at': ['created_at'],
+    'total': ['total'],
+    'status': ['status'],
+    'payment_status': ['payment_status'],
+    'order_type': ['order_type'],
+    'customer_name': ['customer_name'],
+}
+RESERVATION_ORDERINGS = {
+    'id': ['id'],
+    'date': ['date', 'time'],
+    'created_at': ['created_at'],
+    'party_size': ['party_size'],
+    'status': ['status'],
+    'customer_name': ['customer_name'],
+}
+MENU_ITEM_ORDERINGS = {
+    'id': ['id'],
+    'name': ['name'],
+    'price': ['price'],
+    'rating': ['rating'],
+    'created_at': ['created_at'],
+    'updated_at': ['updated_at'],
+}
+USER_ORDERINGS = {
+    'id': ['id'],
+    'username': ['username'],
+    'email': ['email'],
+    'date_joined': ['date_joined'],
+}
+
+
+def filter_orders(queryset, params):
+    """Apply the order list filters (status, payment_status, order_type, search, date_from, date_to)
+
+    Raises ValueError on a malformed date.
+    """
+    status_filter = params.get('status')
+    payment_status = params.get('payment_status')
+    order_type = params.get('order_type')
+    search = params.get('search')
+
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    if payment_status:
+        queryset = queryset.filter(payment_status=payment_status)
+    if order_type:
+        queryset = queryset.filter(order_type=order_type)
+    if search:
+        queryset = queryset.filter(
+            Q(customer_name__icontains=search) | Q(customer_email__icontains=search) | Q(customer_phone__icontains=search)
+        )
+    return filter_created_between(queryset, params.get('date_from'), params.get('date_to'))
+
+
+def filter_reservations(queryset, params):
+    """Apply the reservation list filters (status, date, date_from, date_to, search)"""
+    status_filter = params.get('status')
+    search = params.get('search')
+    date = params.get('date')
+    date_from = params.get('date_from')
+    date_to = params.get('date_to')
+
+    if status_filter:
+        queryset = queryset.filter(status=status_filter)
+    if date:
+        queryset = queryset.filter(date=date)
+    if date_from:
+        queryset = queryset.filter(date__gte=date_from)
+    if date_to:
+        queryset = queryset.filter(date__lte=date_to)
+    if search:
+        queryset = queryset.filter(
+            Q(customer_name__icontains=search) | Q(customer_email__icontains=search) | Q(customer_phone__icontains=search)
+        )
+    return queryset
+
+
 # ============================
 # ADMIN AUTHENTICATION
 # ============================
@@ -137,6 +258,9 @@ def check_admin(request):
 # DASHBOARD STATS
 # ============================
 
+DASHBOARD_CACHE_KEY = 'admin:dashboard_stats'
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def dashboard_stats(request):
@@ -144,88 +268,82 @@ def dashboard_stats(request):
     if not is_admin(request.user):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
-    today = timezone.now().date()
-    week_ago = today - timedelta(days=7)
-    month_ago = today - timedelta(days=30)
+    # Every open admin tab polls this, so share one computation per interval
+    stats = cache.get(DASHBOARD_CACHE_KEY)
+    if stats is None:
+        stats = build_dashboard_stats()
+        cache.set(DASHBOARD_CACHE_KEY, stats, settings.DASHBOARD_CACHE_TIMEOUT)
+    return Response(stats)
+
+
+def build_dashboard_stats():
+    """Compute the dashboard payload with one aggregate query per model"""
+    today = timezone.localdate()
+    today_start = start_of_day(today)
+    week_start = start_of_day(today - timedelta(days=7))
 
     # Orders stats
-    total_orders = Order.objects.count()
-    pending_orders = Order.objects.filter(status='pending').count()
-    today_orders = Order.objects.filter(created_at__date=today).count()
-    completed_orders = Order.objects.filter(status='delivered').count()
-
-    # Revenue stats
-    total_revenue = Order.objects.filter(
-        payment_status='paid'
-    ).aggregate(Sum('total'))['total__sum'] or Decimal('0.00')
-    
-    today_revenue = Order.objects.filter(
-        payment_status='paid',
-        created_at__date=today
-    ).aggregate(Sum('total'))['total__sum'] or Decimal('0.00')
-    
-    week_revenue = Order.objects.filter(
-        payment_status='paid',
-        created_at__date__gte=week_ago
-    ).aggregate(Sum('total'))['total__sum'] or Decimal('0.00')
+    orders = Order.objects.aggregate(
+        total_count=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        today=Count('id', filter=Q(created_at__gte=today_start)),
+        completed=Count('id', filter=Q(status='delivered')),
+    )
+
+    # Revenue stats, from the daily sales rollup
+    revenue = DailySalesRollup.objects.aggregate(
+        total=Sum('paid_revenue'),
+        today=Sum('paid_revenue', filter=Q(date=today)),
+        week=Sum('paid_revenue', filter=Q(date__gte=today - timedelta(days=7))),
+    )
 
     # Reservations stats
-    total_reservations = Reservation.objects.count()
-    pending_reservations = Reservation.objects.filter(status='pending').count()
-    today_reservations = Reservation.objects.filter(date=today).count()
+    reservations = Reservation.objects.aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        today=Count('id', filter=Q(date=today)),
+    )
 
     # Menu stats
-    total_menu_items = MenuItem.objects.count()
-    active_menu_items = MenuItem.objects.filter(is_available=True).count()
-    featured_items = MenuItem.objects.filter(is_featured=True).count()
+    menu = MenuItem.objects.aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_available=True)),
+        featured=Count('id', filter=Q(is_featured=True)),
+    )
 
     # User stats
-    total_users = User.objects.filter(is_staff=False, is_superuser=False).count()
-    new_users_week = User.objects.filter(
-        is_staff=False, 
-        is_superuser=False,
-        date_joined__date__gte=week_ago
-    ).count()
-    active_users = User.objects.filter(is_active=True, is_staff=False, is_superuser=False).count()
+    users = User.objects.filter(is_staff=False, is_superuser=False).aggregate(
+        total=Count('id'),
+        new_this_week=Count('id', filter=Q(date_joined__gte=week_start)),
+        active=Count('id', filter=Q(is_active=True)),
+    )
 
     # Recent orders
-    recent_orders = Order.objects.all()[:5]
+    recent_orders = Order.objects.select_related('user').prefetch_related('items')[:5]
     recent_orders_data = OrderSerializer(recent_orders, many=True).data
 
     # Recent reservations
-    recent_reservations = Reservation.objects.all()[:5]
+    recent_reservations = Reservation.objects.select_related('user')[:5]
     recent_reservations_data = ReservationSerializer(recent_reservations, many=True).data
 
-    return Response({
+    return {
         'orders': {
-            'total': total_orders,
-            'pending': pending_orders,
-            'today': today_orders,
-            'completed': completed_orders,
+            'total': orders['total_count'],
+            'pending': orders['pending'],
+            'today': orders['today'],
+            'completed': orders['completed'],
         },
         'revenue': {
-            'total': float(total_revenue),
-            'today': float(today_revenue),
-            'week': float(week_revenue),
-        },
-        'reservations': {
-            'total': total_reservations,
-            'pending': pending_reservations,
-            'today': today_reservations,
-        },
-        'menu': {
-            'total': total_menu_items,
-            'active': active_menu_items,
-            'featured': featured_items,
-        },
-        'users': {
-            'total': total_users,
-            'new_this_week': new_users_week,
-            'active': active_users,
+            'total': float(revenue['total'] or Decimal('0.00')),
+            'today': float(revenue['today'] or Decimal('0.00')),
+            'week': float(revenue['week'] or Decimal('0.00')),
         },
+        'reservations': reservations,
+        'menu': menu,
+        'users': users,
         'recent_orders': recent_orders_data,
         'recent_reservations': recent_reservations_data,
-    })
+    }
 
 
 # ============================
@@ -240,7 +358,7 @@ def category_list(request):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
-        categories = Category.objects.all()
+        categories = Category.objects.annotate(item_count=Count('items'))
         serializer = CategorySerializer(categories, many=True)
         return Response(serializer.data)
 
@@ -292,7 +410,7 @@ def menu_item_list(request):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
-        items = MenuItem.objects.all()
+        items = MenuItem.objects.select_related('category')
         
         # Filters
         category = request.query_params.get('category')
@@ -309,8 +427,10 @@ def menu_item_list(request):
         if search:
             items = items.filter(name__icontains=search)
 
-        serializer = MenuItemSerializer(items, many=True)
-        return Response(serializer.data)
+        data, error = paginate(items, request.query_params, MenuItemSerializer, MENU_ITEM_ORDERINGS, '-created_at')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
     elif request.method == 'POST':
         serializer = MenuItemSerializer(data=request.data)
@@ -320,6 +440,50 @@ def menu_item_list(request):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def import_menu_items(request):
+    """Create or update menu items in bulk from CSV or JSON
+
+    Accepts an uploaded file (.csv or .json) as "file", or a JSON body with
+    an "items" list. Nothing is written unless every row is valid; pass
+    ?dry_run=true to only see the diff.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+
+    upload = request.FILES.get('file')
+    try:
+        if upload:
+            fmt = 'json' if upload.name.lower().endswith('.json') else 'csv'
+            rows = parse_menu_rows(upload.read().decode('utf-8-sig'), fmt)
+        else:
+            rows = request.data.get('items') if isinstance(request.data, dict) else None
+            if not isinstance(rows, list):
+                raise ValueError('Upload a CSV/JSON "file" or send an "items" list')
+    except (ValueError, UnicodeDecodeError) as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    dry_run = request.query_params.get('dry_run', '').lower() == 'true'
+    try:
+        report = import_menu(rows, dry_run=dry_run)
+    except MenuImportError as e:
+        return Response({'error': 'Invalid rows, nothing was imported', 'rows': e.errors}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(report)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_menu_items(request):
+    """Download all menu items as CSV (default) or JSON, in the import format"""
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+
+    if request.query_params.get('output') == 'json':
+        return Response({'items': list(menu_export_rows())})
+    return export_response(request, 'menu', menu_export_rows(), MENU_EXPORT_FIELDS)
+
+
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def menu_item_detail(request, pk):
@@ -360,28 +524,17 @@ def order_list(request):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
-        orders = Order.objects.all()
-        
-        # Filters
-        status_filter = request.query_params.get('status')
-        payment_status = request.query_params.get('payment_status')
-        order_type = request.query_params.get('order_type')
-        date_from = request.query_params.get('date_from')
-        date_to = request.query_params.get('date_to')
-
-        if status_filter:
-            orders = orders.filter(status=status_filter)
-        if payment_status:
-            orders = orders.filter(payment_status=payment_status)
-        if order_type:
-            orders = orders.filter(order_type=order_type)
-        if date_from:
-            orders = orders.filter(created_at__date__gte=date_from)
-        if date_to:
-            orders = orders.filter(created_at__date__lte=date_to)
-
-        serializer = OrderSerializer(orders, many=True)
-        return Response(serializer.data)
+        try:
+            orders = filter_orders(
+                Order.objects.select_related('user').prefetch_related('items'), request.query_params
+            )
+        except ValueError:
+            return Response({'error': 'Invalid date. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+        data, error = paginate(orders, request.query_params, OrderSerializer, ORDER_ORDERINGS, '-created_at')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
     elif request.method == 'POST':
         serializer = OrderSerializer(data=request.data)
@@ -466,6 +619,89 @@ def update_order_status(request, pk):
     return Response({'error': 'Status or payment_status is required'}, status=status.HTTP_400_BAD_REQUEST)
 
 
+BULK_MAX_IDS = 500
+
+
+def parse_bulk_ids(data):
+    """Distinct integer ids from request data, or raise ValueError"""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        raise ValueError('ids must be a non-empty list')
+    if len(ids) > BULK_MAX_IDS:
+        raise ValueError(f'At most {BULK_MAX_IDS} ids per request')
+    try:
+        return list(dict.fromkeys(int(pk) for pk in ids))
+    except (TypeError, ValueError):
+        raise ValueError('ids must be integers')
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_update_order_status(request):
+    """Move many orders to one status with set-based updates
+
+    Applies the same payment rules as update_order_status: delivered marks
+    pending payments paid, cancelled marks paid payments refunded.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        ids = parse_bulk_ids(request.data)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    new_status = request.data.get('status')
+    if new_status not in dict(Order.STATUS_CHOICES):
+        return Response({'error': 'A valid status is required'}, status=status.HTTP_400_BAD_REQUEST)
+
+    payment_rules = {
+        'delivered': ('pending', 'paid', 1),
+        'cancelled': ('paid', 'refunded', -1),
+    }
+    now = timezone.now()
+
+    with transaction.atomic():
+        orders = Order.objects.select_for_update().filter(pk__in=ids)
+        payments = dict(orders.values_list('id', 'payment_status'))
+
+        paying = []
+        if new_status in payment_rules:
+            current, target, sign = payment_rules[new_status]
+            paying = [pk for pk, payment in payments.items() if payment == current]
+            changing = orders.filter(pk__in=paying)
+            # update() bypasses Order.save(), so move the revenue in the rollup here
+            DailySalesRollup.record_revenue_change(changing, sign)
+            changing.update(payment_status=target)
+            payments.update((pk, target) for pk in paying)
+
+        # Cancelled orders drop out of the per-item counters and come back when un-cancelled
+        if new_status == 'cancelled':
+            DailyItemSales.record_orders_change(orders.exclude(status='cancelled'), -1)
+        else:
+            DailyItemSales.record_orders_change(orders.filter(status='cancelled'), 1)
+
+        # One update moves status and version, so each changed order gains one version
+        orders.filter(~Q(status=new_status) | Q(pk__in=paying)).update(
+            status=new_status, updated_at=now, version=F('version') + 1
+        )
+        # update() sends no post_save, so tell live trackers here
+        transaction.on_commit(partial(publish_orders, list(payments)))
+
+    results = []
+    for pk in ids:
+        if pk in payments:
+            results.append({'id': pk, 'result': 'updated', 'status': new_status, 'payment_status': payments[pk]})
+        else:
+            results.append({'id': pk, 'result': 'not_found'})
+
+    return Response({
+        'message': f'{len(payments)} orders updated to {new_status}',
+        'updated': len(payments),
+        'results': results,
+    })
+
+
 # ============================
 # RESERVATION MANAGEMENT
 # ============================
@@ -478,25 +714,12 @@ def reservation_list(request):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
     if request.method == 'GET':
-        reservations = Reservation.objects.all()
-        
-        # Filters
-        status_filter = request.query_params.get('status')
-        date = request.query_params.get('date')
-        date_from = request.query_params.get('date_from')
-        date_to = request.query_params.get('date_to')
-
-        if status_filter:
-            reservations = reservations.filter(status=status_filter)
-        if date:
-            reservations = reservations.filter(date=date)
-        if date_from:
-            reservations = reservations.filter(date__gte=date_from)
-        if date_to:
-            reservations = reservations.filter(date__lte=date_to)
-
-        serializer = ReservationSerializer(reservations, many=True)
-        return Response(serializer.data)
+        reservations = filter_reservations(Reservation.objects.select_related('user'), request.query_params)
+
+        data, error = paginate(reservations, request.query_params, ReservationSerializer, RESERVATION_ORDERINGS, '-date')
+        if error:
+            return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
     elif request.method == 'POST':
         serializer = ReservationSerializer(data=request.data)
@@ -562,6 +785,67 @@ def update_reservation_status(request, pk):
     })
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_update_reservations(request):
+    """Set the status of many reservations and/or assign their tables
+
+    Body: {"ids": [...], "status": "confirmed"} and/or
+    {"tables": {"<id>": "<table number>", ...}}.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+
+    new_status = request.data.get('status')
+    tables = request.data.get('tables') or {}
+    if not new_status and not tables:
+        return Response({'error': 'status or tables is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if new_status and new_status not in dict(Reservation.STATUS_CHOICES):
+        return Response({'error': 'A valid status is required'}, status=status.HTTP_400_BAD_REQUEST)
+    if not isinstance(tables, dict):
+        return Response({'error': 'tables must map reservation ids to table numbers'}, status=status.HTTP_400_BAD_REQUEST)
+
+    try:
+        ids = parse_bulk_ids(request.data) if new_status else []
+        tables = {int(pk): str(table) for pk, table in tables.items()}
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    if len(tables) > BULK_MAX_IDS:
+        return Response({'error': f'At most {BULK_MAX_IDS} table assignments per request'}, status=status.HTTP_400_BAD_REQUEST)
+
+    requested = list(dict.fromkeys(ids + list(tables)))
+    now = timezone.now()
+
+    with transaction.atomic():
+        reservations = Reservation.objects.select_for_update().filter(pk__in=requested)
+        found = set(reservations.values_list('id', flat=True))
+        if new_status:
+            reservations.filter(pk__in=ids).update(status=new_status, updated_at=now)
+        if tables:
+            # One UPDATE for every assignment: table_number = CASE id WHEN ... END
+            reservations.filter(pk__in=tables).update(
+                table_number=Case(*[When(pk=pk, then=Value(table)) for pk, table in tables.items()]),
+                updated_at=now,
+            )
+        current = {
+            row['id']: row
+            for row in Reservation.objects.filter(pk__in=found).values('id', 'status', 'table_number')
+        }
+
+    results = []
+    for pk in requested:
+        if pk in current:
+            results.append({'id': pk, 'result': 'updated', **current[pk]})
+        else:
+            results.append({'id': pk, 'result': 'not_found'})
+
+    return Response({
+        'message': f'{len(current)} reservations updated',
+        'updated': len(current),
+        'results': results,
+    })
+
+
 # ============================
 # USER MANAGEMENT
 # ============================
@@ -573,7 +857,7 @@ def user_list(request):
     if not is_admin(request.user):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
-    users = User.objects.filter(is_superuser=False).order_by('-date_joined')
+    users = User.objects.filter(is_superuser=False).select_related('profile').order_by('-date_joined')
     
     # Filters
     is_active = request.query_params.get('is_active')
@@ -587,8 +871,10 @@ def user_list(request):
     if search:
         users = users.filter(username__icontains=search) | users.filter(email__icontains=search)
 
-    serializer = UserSerializer(users, many=True)
-    return Response(serializer.data)
+    data, error = paginate(users, request.query_params, UserSerializer, USER_ORDERINGS, '-date_joined')
+    if error:
+        return Response({'error': error}, status=status.HTTP_400_BAD_REQUEST)
+    return Response(data)
 
 
 @api_view(['GET', 'PUT', 'DELETE'])
@@ -669,38 +955,140 @@ def toggle_user_status(request, pk):
 # REPORTS
 # ============================
 
+SALES_GRANULARITIES = {
+    'hour': TruncHour,
+    'day': TruncDate,
+    'week': TruncWeek,
+    'month': TruncMonth,
+}
+
+
+def report_window(params, default_days=30):
+    """Inclusive (date_from, date_to) from ?date_from/?date_to or ?days
+
+    ?days=N keeps the original meaning: the N whole days before today.
+    Raises ValueError on malformed input.
+    """
+    today = timezone.localdate()
+    date_from = params.get('date_from')
+    date_to = params.get('date_to')
+    if date_from or date_to:
+        date_to = date.fromisoformat(date_to) if date_to else today
+        date_from = date.fromisoformat(date_from) if date_from else date_to - timedelta(days=default_days - 1)
+    else:
+        days = int(params.get('days', default_days))
+        date_from = today - timedelta(days=days)
+        date_to = today - timedelta(days=1)
+    if date_from > date_to:
+        raise ValueError('date_from is after date_to')
+    return date_from, date_to
+
+
+def sales_buckets(date_from, date_to, granularity):
+    """Every bucket start between two dates, used to fill days without sales"""
+    if granularity == 'hour':
+        current = start_of_day(date_from)
+        end = start_of_day(date_to + timedelta(days=1))
+        buckets = []
+        while current < end:
+            buckets.append(timezone.localtime(current))
+            current += timedelta(hours=1)
+        return buckets
+    if granularity == 'week':
+        current = date_from - timedelta(days=date_from.weekday())
+        step = lambda day: day + timedelta(days=7)
+    elif granularity == 'month':
+        current = date_from.replace(day=1)
+        step = lambda day: (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    else:
+        current = date_from
+        step = lambda day: day + timedelta(days=1)
+    buckets = []
+    while current <= date_to:
+        buckets.append(current)
+        current = step(current)
+    return buckets
+
+
+def bucket_key(value, granularity):
+    """Normalize a Trunc result to the keys produced by sales_buckets"""
+    if granularity == 'hour':
+        return timezone.localtime(value)
+    if isinstance(value, datetime):
+        return timezone.localtime(value).date()
+    return value
+
+
+def fill_sales_series(rows, date_from, date_to, granularity):
+    """Dense series of {date, revenue, orders} with zeroes for empty buckets"""
+    by_bucket = {bucket_key(row['bucket'], granularity): row for row in rows}
+    series = []
+    for bucket in sales_buckets(date_from, date_to, granularity):
+        row = by_bucket.get(bucket, {})
+        series.append({
+            'date': bucket.isoformat(),
+            'revenue': float(row.get('revenue') or Decimal('0.00')),
+            'orders': row.get('orders') or 0
+        })
+    return series
+
+
+def live_sales_series(date_from, date_to, granularity='day'):
+    """Revenue and order counts per bucket from raw orders in one GROUP BY query"""
+    rows = filter_created_between(Order.objects.all(), date_from.isoformat(), date_to.isoformat()).annotate(
+        bucket=SALES_GRANULARITIES[granularity]('created_at'),
+    ).values('bucket').annotate(
+        revenue=Sum('total', filter=Q(payment_status='paid')),
+        orders=Count('id'),
+    ).order_by()
+    return fill_sales_series(rows, date_from, date_to, granularity)
+
+
+def rollup_sales_series(date_from, date_to):
+    """Daily revenue and order counts from the daily sales rollup"""
+    rows = DailySalesRollup.objects.filter(date__gte=date_from, date__lte=date_to).values(
+        bucket=F('date'),
+    ).annotate(
+        revenue=Sum('paid_revenue'),
+        orders=Sum('order_count'),
+    ).order_by()
+    return fill_sales_series(rows, date_from, date_to, 'day')
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def sales_report(request):
-    """Get sales report"""
+    """Get sales report
+
+    Query params: days (default 30) or date_from/date_to (YYYY-MM-DD),
+    granularity=hour|day|week|month, live=true to compute daily figures
+    from raw orders instead of the daily sales rollup, and
+    window=1d|7d|30d|all for top_items.
+    """
     if not is_admin(request.user):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
-    days = int(request.query_params.get('days', 30))
-    start_date = timezone.now().date() - timedelta(days=days)
-
-    # Daily revenue
-    daily_revenue = []
-    for i in range(days):
-        date = start_date + timedelta(days=i)
-        revenue = Order.objects.filter(
-            payment_status='paid',
-            created_at__date=date
-        ).aggregate(Sum('total'))['total__sum'] or Decimal('0.00')
-        
-        orders_count = Order.objects.filter(created_at__date=date).count()
-        
-        daily_revenue.append({
-            'date': date.isoformat(),
-            'revenue': float(revenue),
-            'orders': orders_count
-        })
-
-    # Top selling items
-    top_items = OrderItem.objects.values('item_name').annotate(
-        total_quantity=Sum('quantity'),
-        total_revenue=Sum('subtotal')
-    ).order_by('-total_quantity')[:10]
+    try:
+        date_from, date_to = report_window(request.query_params)
+    except ValueError:
+        return Response({'error': 'Invalid date range. Use days=N or date_from/date_to as YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    granularity = request.query_params.get('granularity', 'day')
+    if granularity not in SALES_GRANULARITIES:
+        return Response({'error': f"granularity must be one of: {', '.join(SALES_GRANULARITIES)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Revenue series; whole days are served from the rollup unless live figures are asked for
+    live = request.query_params.get('live', '').lower() == 'true'
+    if granularity == 'day' and not live:
+        daily_revenue = rollup_sales_series(date_from, date_to)
+    else:
+        daily_revenue = live_sales_series(date_from, date_to, granularity)
+
+    # Top selling items, from the per-item daily counters
+    window = request.query_params.get('window', 'all')
+    if window not in POPULAR_WINDOWS:
+        return Response({'error': f"window must be one of: {', '.join(POPULAR_WINDOWS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    top_items = DailyItemSales.top_items(window, 10)
 
     # Order types distribution
     order_types = Order.objects.values('order_type').annotate(
@@ -709,26 +1097,290 @@ def sales_report(request):
     )
 
     return Response({
+        'granularity': granularity,
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
         'daily_revenue': daily_revenue,
         'top_items': list(top_items),
         'order_types': list(order_types),
     })
 
 
+HEATMAP_WEEKDAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def build_demand_heatmap(date_from, date_to):
+    """Weekday x hour matrices of orders, paid revenue and average paid ticket per order type
+
+    One grouped query; weekday and hour are taken in TIME_ZONE. Matrices
+    are indexed [weekday][hour] with Monday first.
+    """
+    tz = ZoneInfo(settings.TIME_ZONE)
+    rows = filter_created_between(Order.objects.all(), date_from.isoformat(), date_to.isoformat()).annotate(
+        weekday=ExtractWeekDay('created_at', tzinfo=tz),
+        hour=ExtractHour('created_at', tzinfo=tz),
+    ).values('order_type', 'weekday', 'hour').annotate(
+        orders=Count('id'),
+        paid_orders=Count('id', filter=Q(payment_status='paid')),
+        revenue=Sum('total', filter=Q(payment_status='paid')),
+    ).order_by()
+
+    def empty():
+        return {
+            'orders': [[0] * 24 for _ in range(7)],
+            'paid_orders': [[0] * 24 for _ in range(7)],
+            'revenue': [[Decimal('0.00')] * 24 for _ in range(7)],
+        }
+
+    matrices = {order_type: empty() for order_type, _ in Order.ORDER_TYPE_CHOICES}
+    matrices['all'] = empty()
+    for row in rows:
+        day = (row['weekday'] + 5) % 7  # ExtractWeekDay counts from Sunday = 1
+        hour = row['hour']
+        for key in (row['order_type'], 'all'):
+            matrix = matrices.setdefault(key, empty())
+            matrix['orders'][day][hour] += row['orders']
+            matrix['paid_orders'][day][hour] += row['paid_orders']
+            matrix['revenue'][day][hour] += row['revenue'] or Decimal('0.00')
+
+    order_types = {}
+    for key, matrix in matrices.items():
+        order_types[key] = {
+            'orders': matrix['orders'],
+            'revenue': [[float(value) for value in hours] for hours in matrix['revenue']],
+            'avg_ticket': [
+                [float(revenue / paid) if paid else 0.0 for revenue, paid in zip(revenues, paids)]
+                for revenues, paids in zip(matrix['revenue'], matrix['paid_orders'])
+            ],
+        }
+    return {
+        'date_from': date_from.isoformat(),
+        'date_to': date_to.isoformat(),
+        'timezone': settings.TIME_ZONE,
+        'weekdays': HEATMAP_WEEKDAYS,
+        'hours': list(range(24)),
+        'order_types': order_types,
+    }
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def demand_heatmap(request):
+    """Get a 7x24 weekday by hour demand heatmap
+
+    Query params: days (default 30) or date_from/date_to (YYYY-MM-DD).
+    Ranges that ended before today cannot change any more, so they are
+    cached without expiry.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+
+    try:
+        date_from, date_to = report_window(request.query_params)
+    except ValueError:
+        return Response({'error': 'Invalid date range. Use days=N or date_from/date_to as YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if date_to >= timezone.localdate():
+        return Response(build_demand_heatmap(date_from, date_to))
+
+    key = f'admin:heatmap:{settings.TIME_ZONE}:{date_from.isoformat()}:{date_to.isoformat()}'
+    data = cache.get(key)
+    if data is None:
+        data = build_demand_heatmap(date_from, date_to)
+        cache.set(key, data, None)
+    return Response(data)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def popular_items(request):
-    """Get popular menu items"""
+    """Get popular menu items
+
+    Query params: limit (default 10) and window=1d|7d|30d|all (default all).
+    Served from the per-item daily counters; cancelled orders are not counted.
+    """
     if not is_admin(request.user):
         return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
 
     limit = int(request.query_params.get('limit', 10))
+    window = request.query_params.get('window', 'all')
+    if window not in POPULAR_WINDOWS:
+        return Response({'error': f"window must be one of: {', '.join(POPULAR_WINDOWS)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(list(DailyItemSales.top_items(window, limit)))
+
+
+
+# ============================
+# EXPORTS
+# ============================
+
+EXPORT_CHUNK_SIZE = 2000
+
+ORDER_EXPORT_FIELDS = [
+    'id', 'created_at', 'customer_name', 'customer_email', 'customer_phone', 'customer_address',
+    'order_type', 'status', 'payment_status', 'subtotal', 'tax', 'total', 'special_instructions',
+]
+ORDER_ITEM_EXPORT_FIELDS = ['id', 'menu_item_id', 'item_name', 'item_price', 'quantity', 'subtotal']
+RESERVATION_EXPORT_FIELDS = [
+    'id', 'date', 'time', 'customer_name', 'customer_email', 'customer_phone', 'party_size',
+    'table_number', 'status', 'special_requests', 'created_at',
+]
+
+EXPORT_FORMATS = {
+    'csv': 'text/csv',
+    'ndjson': 'application/x-ndjson',
+}
+
+
+class Echo:
+    """File-like object whose write() returns the value, for streaming csv.writer output"""
+
+    def write(self, value):
+        return value
+
+
+def export_value(value):
+    """Render a value for a CSV cell"""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def chunked(iterable, size):
+    """Yield lists of up to size items from an iterable"""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def orders_with_items(orders):
+    """Yield order rows with their items attached, fetching items once per chunk of orders"""
+    rows = orders.values(*ORDER_EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    for chunk in chunked(rows, EXPORT_CHUNK_SIZE):
+        items = {}
+        item_rows = OrderItem.objects.filter(
+            order_id__in=[row['id'] for row in chunk]
+        ).values('order_id', *ORDER_ITEM_EXPORT_FIELDS).order_by('order_id', 'id')
+        for item in item_rows:
+            items.setdefault(item.pop('order_id'), []).append(item)
+        for row in chunk:
+            row['items'] = items.get(row['id'], [])
+            yield row
+
+
+def export_order_rows(orders):
+    """One row per order, with the number of items"""
+    for order in orders_with_items(orders):
+        items = order.pop('items')
+        order['item_count'] = sum(item['quantity'] for item in items)
+        yield order
+
+
+def export_order_item_rows(orders):
+    """One row per order line, carrying the order it belongs to"""
+    for order in orders_with_items(orders):
+        for item in order['items']:
+            yield {
+                'order_id': order['id'],
+                'order_created_at': order['created_at'],
+                'order_type': order['order_type'],
+                'order_status': order['status'],
+                'payment_status': order['payment_status'],
+                **item,
+            }
+
+
+def export_reservation_rows(reservations):
+    return reservations.values(*RESERVATION_EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+
+
+def stream_csv(rows, header):
+    writer = csv.writer(Echo())
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([export_value(row[field]) for field in header])
+
+
+def stream_ndjson(rows, header):
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
+
+
+def export_response(request, name, rows, header):
+    """Stream rows as CSV (default) or NDJSON (?output=ndjson) as a download"""
+    output = request.query_params.get('output', 'csv')
+    stream = stream_ndjson if output == 'ndjson' else stream_csv
+    extension = 'ndjson' if output == 'ndjson' else 'csv'
+    response = StreamingHttpResponse(stream(rows, header), content_type=EXPORT_FORMATS[extension])
+    filename = f'{name}-{timezone.localdate().isoformat()}.{extension}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def check_export_output(request):
+    output = request.query_params.get('output', 'csv')
+    if output not in EXPORT_FORMATS:
+        return Response({'error': f"output must be one of: {', '.join(EXPORT_FORMATS)}"}, status=status.HTTP_400_BAD_REQUEST)
+    return None
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_orders(request):
+    """Stream orders as CSV or NDJSON, with the same filters as the order list
+
+    NDJSON rows carry their items; CSV rows carry an item_count.
+    """
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+    error = check_export_output(request)
+    if error:
+        return error
+
+    try:
+        orders = filter_orders(Order.objects.order_by('id'), request.query_params)
+    except ValueError:
+        return Response({'error': 'Invalid date. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    if request.query_params.get('output') == 'ndjson':
+        return export_response(request, 'orders', orders_with_items(orders), None)
+    return export_response(request, 'orders', export_order_rows(orders), ORDER_EXPORT_FIELDS + ['item_count'])
+
 
-    items = OrderItem.objects.values('item_name', 'menu_item').annotate(
-        total_orders=Count('id'),
-        total_quantity=Sum('quantity'),
-        total_revenue=Sum('subtotal')
-    ).order_by('-total_quantity')[:limit]
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_order_items(request):
+    """Stream order lines as CSV or NDJSON, filtered by their orders"""
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+    error = check_export_output(request)
+    if error:
+        return error
 
-    return Response(list(items))
+    try:
+        orders = filter_orders(Order.objects.order_by('id'), request.query_params)
+    except ValueError:
+        return Response({'error': 'Invalid date. Use YYYY-MM-DD'}, status=status.HTTP_400_BAD_REQUEST)
+
+    header = ['order_id', 'order_created_at', 'order_type', 'order_status', 'payment_status'] + ORDER_ITEM_EXPORT_FIELDS
+    return export_response(request, 'order-items', export_order_item_rows(orders), header)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_reservations(request):
+    """Stream reservations as CSV or NDJSON, with the same filters as the reservation list"""
+    if not is_admin(request.user):
+        return Response({'error': 'Not authorized'}, status=status.HTTP_403_FORBIDDEN)
+    error = check_export_output(request)
+    if error:
+        return error
 
+    reservations = filter_reservations(Reservation.objects.order_by('id'), request.query_params)
+    return export_response(request, 'reservations', export_reservation_rows(reservations), RESERVATION_EXPORT_FIELDS)
@@ -14,6 +14,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 from dotenv import load_dotenv
+from corsheaders.defaults import default_headers
 
 # Load environment variables
 load_dotenv()
@@ -87,6 +88,10 @@ CORS_ALLOWED_ORIGINS = [
  "http://127.0.0.1:5173",
 ]
 
+# Allow clients to send Idempotency-Key on order/reservation POSTs
+CORS_ALLOW_HEADERS = (*default_headers, 'idempotency-key')
+CORS_EXPOSE_HEADERS = ['Idempotent-Replayed']
+
 REST_FRAMEWORK = {
  'DEFAULT_AUTHENTICATION_CLASSES': (
      'rest_framework_simplejwt.authentication.JWTAuthentication',
@@ -125,6 +130,47 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Point CACHE_BACKEND/CACHE_LOCATION at a shared cache (e.g. Redis) when
+# running several workers so menu version bumps are seen by all of them.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'smart-dine'),
+    }
+}
+
+# How long a menu snapshot may sit in the cache (seconds). Snapshots are keyed
+# by the menu version, so this only bounds memory use, never staleness.
+MENU_CACHE_TIMEOUT = int(os.getenv('MENU_CACHE_TIMEOUT', 60 * 60 * 24))
+
+# Orders are priced from an in-process table that re-checks the database for
+# menu changes made by other workers at most this often (seconds)
+PRICE_TABLE_MAX_AGE = float(os.getenv('PRICE_TABLE_MAX_AGE', 5))
+
+# Admin dashboard stats are shared by all admins for this many seconds
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 5))
+
+# Static menu export (see `manage.py export_menu`). Files are written under
+# MEDIA_ROOT/menu-export for a CDN or web server to pick up.
+MENU_EXPORT_ON_SAVE = os.getenv('MENU_EXPORT_ON_SAVE', 'False') == 'True'
+MENU_EXPORT_SERVE = os.getenv('MENU_EXPORT_SERVE', 'False') == 'True'
+
+# /api/menu/changes/ re-sends rows updated this many seconds before the cursor,
+# so rows from transactions that committed late are not skipped.
+MENU_CHANGES_OVERLAP = int(os.getenv('MENU_CHANGES_OVERLAP', 60))
+
+# Deletion tombstones for the changes feed are kept this many seconds; older
+# cursors get a full resync. Run `manage.py purge_menu_tombstones` periodically.
+MENU_TOMBSTONE_RETENTION = int(os.getenv('MENU_TOMBSTONE_RETENTION', 60 * 60 * 24 * 30))
+
+# Responses to POSTs sent with an Idempotency-Key header are replayed for
+# this many seconds. Run `manage.py purge_idempotency_keys` periodically.
+IDEMPOTENCY_KEY_TTL = int(os.getenv('IDEMPOTENCY_KEY_TTL', 60 * 60 * 24))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
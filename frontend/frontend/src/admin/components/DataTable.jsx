@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useState, useEffect } from "react";
 import { FiChevronLeft, FiChevronRight, FiSearch } from "react-icons/fi";
 
 const DataTable = ({
@@ -9,28 +9,61 @@ const DataTable = ({
   searchPlaceholder = "Search...",
   pageSize = 10,
   actions,
+  // Server-side mode: `data` is the current page only, `totalCount` the
+  // number of matching rows, and onQueryChange({ page, pageSize, ordering,
+  // search }) is called whenever the page, sort column or search changes.
+  serverSide = false,
+  totalCount = 0,
+  onQueryChange,
 }) => {
   const [currentPage, setCurrentPage] = useState(1);
   const [searchTerm, setSearchTerm] = useState("");
+  const [ordering, setOrdering] = useState("");
+
+  useEffect(() => {
+    if (!serverSide || !onQueryChange) return;
+    const timer = setTimeout(() => {
+      onQueryChange({ page: currentPage, pageSize, ordering, search: searchTerm });
+    }, 250);
+    return () => clearTimeout(timer);
+  }, [serverSide, currentPage, pageSize, ordering, searchTerm]);
 
   // Filter data based on search term
-  const filteredData = data.filter((item) =>
-    columns.some((col) => {
-      const value = item[col.key];
-      if (value == null) return false;
-      return String(value).toLowerCase().includes(searchTerm.toLowerCase());
-    })
-  );
+  const filteredData = serverSide
+    ? data
+    : data.filter((item) =>
+        columns.some((col) => {
+          const value = item[col.key];
+          if (value == null) return false;
+          return String(value).toLowerCase().includes(searchTerm.toLowerCase());
+        })
+      );
 
   // Pagination
-  const totalPages = Math.ceil(filteredData.length / pageSize);
+  const rowCount = serverSide ? totalCount : filteredData.length;
+  const totalPages = Math.ceil(rowCount / pageSize);
   const startIndex = (currentPage - 1) * pageSize;
-  const paginatedData = filteredData.slice(startIndex, startIndex + pageSize);
+  const paginatedData = serverSide
+    ? filteredData
+    : filteredData.slice(startIndex, startIndex + pageSize);
 
   const handlePageChange = (page) => {
     setCurrentPage(page);
   };
 
+  // Clicking a sortable header cycles ascending -> descending
+  const handleSort = (col) => {
+    if (!serverSide || !col.sortable) return;
+    setOrdering((prev) => (prev === col.key ? `-${col.key}` : col.key));
+    setCurrentPage(1);
+  };
+
+  const sortIndicator = (col) => {
+    if (ordering === col.key) return " ▲";
+    if (ordering === `-${col.key}`) return " ▼";
+    return "";
+  };
+
   return (
     <div className="data-table-container">
       {searchable && (
@@ -53,8 +86,13 @@ const DataTable = ({
           <thead>
             <tr>
               {columns.map((col) => (
-                <th key={col.key} style={{ width: col.width }}>
+                <th
+                  key={col.key}
+                  style={{ width: col.width, cursor: serverSide && col.sortable ? "pointer" : undefined }}
+                  onClick={() => handleSort(col)}
+                >
                   {col.label}
+                  {serverSide && col.sortable && sortIndicator(col)}
                 </th>
               ))}
               {actions && <th className="actions-column">Actions</th>}
@@ -96,8 +134,8 @@ const DataTable = ({
         <div className="data-table-pagination">
           <span className="pagination-info">
             Showing {startIndex + 1} to{" "}
-            {Math.min(startIndex + pageSize, filteredData.length)} of{" "}
-            {filteredData.length} entries
+            {Math.min(startIndex + pageSize, rowCount)} of{" "}
+            {rowCount} entries
           </span>
           <div className="pagination-controls">
             <button
@@ -2,7 +2,7 @@ import { useState, useEffect } from "react";
 import { FiEye, FiCheck, FiX, FiTruck, FiClock } from "react-icons/fi";
 import DataTable from "../components/DataTable";
 import Modal from "../components/Modal";
-import { getOrders, updateOrderStatus } from "../services/adminService";
+import { getOrdersPage, updateOrderStatus } from "../services/adminService";
 import "../styles/admin.css";
 
 const ManageOrders = () => {
@@ -11,17 +11,21 @@ const ManageOrders = () => {
   const [selectedOrder, setSelectedOrder] = useState(null);
   const [detailModalOpen, setDetailModalOpen] = useState(false);
   const [statusFilter, setStatusFilter] = useState("");
+  const [totalCount, setTotalCount] = useState(0);
+  const [query, setQuery] = useState({ page: 1, pageSize: 10, ordering: "", search: "" });
 
   useEffect(() => {
     fetchOrders();
-  }, [statusFilter]);
+  }, [statusFilter, query]);
 
+  // Orders are paged, sorted and searched on the server
   const fetchOrders = async () => {
     try {
-      const params = {};
+      const params = { ...query };
       if (statusFilter) params.status = statusFilter;
-      const data = await getOrders(params);
-      setOrders(data);
+      const data = await getOrdersPage(params);
+      setOrders(data.results);
+      setTotalCount(data.count);
     } catch (err) {
       console.error("Failed to fetch orders:", err);
     } finally {
@@ -30,8 +34,8 @@ const ManageOrders = () => {
   };
 
   const columns = [
-    { key: "id", label: "Order #", width: "80px" },
-    { key: "customer_name", label: "Customer" },
+    { key: "id", label: "Order #", width: "80px", sortable: true },
+    { key: "customer_name", label: "Customer", sortable: true },
     { key: "customer_phone", label: "Phone" },
     {
       key: "order_type",
@@ -42,7 +46,7 @@ const ManageOrders = () => {
         </span>
       ),
     },
-    { key: "total", label: "Total", render: (val) => `₹${val}` },
+    { key: "total", label: "Total", render: (val) => `₹${val}`, sortable: true },
     {
       key: "payment_status",
       label: "Payment",
@@ -60,6 +64,7 @@ const ManageOrders = () => {
     {
       key: "created_at",
       label: "Date",
+      sortable: true,
       render: (val) => new Date(val).toLocaleString(),
     },
   ];
@@ -207,6 +212,11 @@ const ManageOrders = () => {
           pageSize={10}
           actions={actions}
           onRowClick={handleViewOrder}
+          serverSide={true}
+          totalCount={totalCount}
+          onQueryChange={(next) =>
+            setQuery((prev) => (JSON.stringify(prev) === JSON.stringify(next) ? prev : next))
+          }
         />
       </div>
 
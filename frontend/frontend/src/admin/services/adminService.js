@@ -23,6 +23,17 @@ const getAdminConfig = () => {
   };
 };
 
+// List endpoints return a plain array unless a page is requested. Passing
+// page/page_size (or cursor for keyset paging) returns
+// { count, page, page_size, num_pages, ordering, results } instead. Keyset
+// pages after the first have count: null unless count=true is passed.
+const toPageParams = ({ page = 1, pageSize = 25, ordering, search, ...filters } = {}) => {
+  const params = { ...filters, page, page_size: pageSize };
+  if (ordering) params.ordering = ordering;
+  if (search) params.search = search;
+  return params;
+};
+
 // ============================
 // AUTHENTICATION
 // ============================
@@ -116,6 +127,32 @@ export const getMenuItems = async (params = {}) => {
   return response.data;
 };
 
+export const getMenuItemsPage = async (query = {}) => {
+  return getMenuItems(toPageParams(query));
+};
+
+// file: a .csv or .json File; nothing is written unless every row is valid
+export const importMenuItems = async (file, dryRun = false) => {
+  const config = getAdminConfig();
+  const formData = new FormData();
+  formData.append("file", file);
+  const response = await api.post(`${ADMIN_API}/menu/import/`, formData, {
+    headers: { ...config.headers, "Content-Type": "multipart/form-data" },
+    params: { dry_run: dryRun },
+  });
+  return response.data;
+};
+
+export const exportMenuItems = async (output = "csv") => {
+  const config = getAdminConfig();
+  const response = await api.get(`${ADMIN_API}/menu/export/`, {
+    ...config,
+    params: { output },
+    responseType: output === "csv" ? "blob" : "json",
+  });
+  return response.data;
+};
+
 export const getMenuItem = async (id) => {
   const config = getAdminConfig();
   const response = await api.get(`${ADMIN_API}/menu/${id}/`, config);
@@ -150,6 +187,10 @@ export const getOrders = async (params = {}) => {
   return response.data;
 };
 
+export const getOrdersPage = async (query = {}) => {
+  return getOrders(toPageParams(query));
+};
+
 export const getOrder = async (id) => {
   const config = getAdminConfig();
   const response = await api.get(`${ADMIN_API}/orders/${id}/`, config);
@@ -168,6 +209,12 @@ export const updateOrderStatus = async (id, status) => {
   return response.data;
 };
 
+export const bulkUpdateOrderStatus = async (ids, status) => {
+  const config = getAdminConfig();
+  const response = await api.post(`${ADMIN_API}/orders/bulk-status/`, { ids, status }, config);
+  return response.data;
+};
+
 export const deleteOrder = async (id) => {
   const config = getAdminConfig();
   const response = await api.delete(`${ADMIN_API}/orders/${id}/`, config);
@@ -184,6 +231,10 @@ export const getReservations = async (params = {}) => {
   return response.data;
 };
 
+export const getReservationsPage = async (query = {}) => {
+  return getReservations(toPageParams(query));
+};
+
 export const getReservation = async (id) => {
   const config = getAdminConfig();
   const response = await api.get(`${ADMIN_API}/reservations/${id}/`, config);
@@ -204,6 +255,19 @@ export const updateReservationStatus = async (id, status, tableNumber = null) =>
   return response.data;
 };
 
+// tables: { [reservationId]: tableNumber }
+export const bulkUpdateReservations = async ({ ids = [], status, tables } = {}) => {
+  const config = getAdminConfig();
+  const data = {};
+  if (status) {
+    data.ids = ids;
+    data.status = status;
+  }
+  if (tables) data.tables = tables;
+  const response = await api.post(`${ADMIN_API}/reservations/bulk-update/`, data, config);
+  return response.data;
+};
+
 export const deleteReservation = async (id) => {
   const config = getAdminConfig();
   const response = await api.delete(`${ADMIN_API}/reservations/${id}/`, config);
@@ -220,6 +284,10 @@ export const getUsers = async (params = {}) => {
   return response.data;
 };
 
+export const getUsersPage = async (query = {}) => {
+  return getUsers(toPageParams(query));
+};
+
 export const getUser = async (id) => {
   const config = getAdminConfig();
   const response = await api.get(`${ADMIN_API}/users/${id}/`, config);
@@ -254,8 +322,31 @@ export const getSalesReport = async (days = 30) => {
   return response.data;
 };
 
-export const getPopularItems = async (limit = 10) => {
+// params: { days } or { date_from, date_to } (YYYY-MM-DD)
+export const getDemandHeatmap = async (params = { days: 30 }) => {
+  const config = getAdminConfig();
+  const response = await api.get(`${ADMIN_API}/reports/heatmap/`, { ...config, params });
+  return response.data;
+};
+
+// window: "1d" | "7d" | "30d" | "all"
+export const getPopularItems = async (limit = 10, window = "all") => {
+  const config = getAdminConfig();
+  const response = await api.get(`${ADMIN_API}/reports/popular-items/`, { ...config, params: { limit, window } });
+  return response.data;
+};
+
+// ============================
+// EXPORTS
+// ============================
+
+// dataset: "orders" | "order-items" | "reservations"; output: "csv" | "ndjson"
+export const exportData = async (dataset, params = {}, output = "csv") => {
   const config = getAdminConfig();
-  const response = await api.get(`${ADMIN_API}/reports/popular-items/`, { ...config, params: { limit } });
+  const response = await api.get(`${ADMIN_API}/export/${dataset}/`, {
+    ...config,
+    params: { ...params, output },
+    responseType: "blob",
+  });
   return response.data;
 };
@@ -1,32 +1,13 @@
-import React, { useState, useEffect } from 'react';
+import React from 'react';
 import { Link, useNavigate } from 'react-router-dom';
-import { fetchMenuItems } from '../../services/menuService';
 import { useCart } from '../../context/CartContext';
 import '../../styles/featuredMenu.css';
 
-const FeaturedMenu = () => {
-  const [featuredItems, setFeaturedItems] = useState([]);
-  const [loading, setLoading] = useState(true);
+// Items are loaded by the home page from the menu bootstrap endpoint
+const FeaturedMenu = ({ items: featuredItems = [], loading = false }) => {
   const { addToCart } = useCart();
   const navigate = useNavigate();
 
-  useEffect(() => {
-    const loadFeaturedItems = async () => {
-      try {
-        const data = await fetchMenuItems();
-        // Get featured items or first 6 items
-        const featured = data.filter(item => item.is_featured).slice(0, 6);
-        setFeaturedItems(featured.length > 0 ? featured : data.slice(0, 6));
-      } catch (error) {
-        console.error("Error loading featured items:", error);
-        setFeaturedItems([]);
-      } finally {
-        setLoading(false);
-      }
-    };
-    loadFeaturedItems();
-  }, []);
-
   const handleAddToCart = (item) => {
     addToCart(item);
   };
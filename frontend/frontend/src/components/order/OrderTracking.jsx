@@ -1,25 +1,26 @@
 import React, { useContext, useEffect, useState } from 'react';
 import { OrderContext } from '../../context/OrderContext';
+import orderService from '../../services/orderService';
 import Loader from '../common/Loader';
 import '../../styles/order.css';
 
 const OrderTracking = () => {
-    const { currentOrder, fetchOrderStatus } = useContext(OrderContext);
+    const { currentOrder } = useContext(OrderContext);
     const [loading, setLoading] = useState(true);
     const [orderStatus, setOrderStatus] = useState(null);
 
     useEffect(() => {
-        const getOrderStatus = async () => {
-            setLoading(true);
-            const status = await fetchOrderStatus(currentOrder.id);
-            setOrderStatus(status);
+        if (!currentOrder) {
             setLoading(false);
-        };
-
-        if (currentOrder) {
-            getOrderStatus();
+            return undefined;
         }
-    }, [currentOrder, fetchOrderStatus]);
+        setLoading(true);
+        // Live updates pushed by the server instead of repeated fetches
+        return orderService.watchOrder(currentOrder.id, (state) => {
+            setOrderStatus(state.status);
+            setLoading(false);
+        });
+    }, [currentOrder]);
 
     if (loading) {
         return <Loader />;
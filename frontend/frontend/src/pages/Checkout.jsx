@@ -81,6 +81,7 @@ const Checkout = () => {
                     name: formData.firstName + ' ' + formData.lastName,
                     email: formData.email,
                     items: cartItems.map(item => ({
+                        id: item.id,
                         name: item.name,
                         description: item.description || item.name + ' - Delicious food item',
                         price: item.price,
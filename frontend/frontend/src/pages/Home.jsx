@@ -1,16 +1,37 @@
-import React from 'react';
+import React, { useState, useEffect } from 'react';
 import Hero from '../components/home/Hero';
 import FeaturedMenu from '../components/home/FeaturedMenu';
 import Testimonials from '../components/home/Testimonials';
+import { fetchMenuBootstrap } from '../services/menuService';
 
 const Home = () => {
+    const [featuredItems, setFeaturedItems] = useState([]);
+    const [loading, setLoading] = useState(true);
+
+    // Categories, featured items and the first menu page come in one request
+    useEffect(() => {
+        const loadBootstrap = async () => {
+            try {
+                const { featured, menu } = await fetchMenuBootstrap(6);
+                // Get featured items or first 6 items
+                setFeaturedItems(featured.length > 0 ? featured.slice(0, 6) : menu.results);
+            } catch (error) {
+                console.error("Error loading featured items:", error);
+                setFeaturedItems([]);
+            } finally {
+                setLoading(false);
+            }
+        };
+        loadBootstrap();
+    }, []);
+
     return (
         <div>
             <Hero />
-            <FeaturedMenu />
+            <FeaturedMenu items={featuredItems} loading={loading} />
             <Testimonials />
         </div>
     );
 };
 
-export default Home;
\ No newline at end of file
+export default Home;
@@ -1,6 +1,6 @@
 import React, { useState, useMemo, useEffect } from "react";
 import { useNavigate } from "react-router-dom";
-import { fetchMenuItems } from "../services/menuService";
+import { fetchMenuItems, fetchMenuSuggestions } from "../services/menuService";
 import { useCart } from "../context/CartContext";
 import "../styles/menu.css";
 
@@ -9,26 +9,50 @@ const Menu = () => {
   const navigate = useNavigate();
   const [menuItems, setMenuItems] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [searchInput, setSearchInput] = useState("");
   const [searchQuery, setSearchQuery] = useState("");
+  const [suggestions, setSuggestions] = useState({ items: [], categories: [] });
+  const [showSuggestions, setShowSuggestions] = useState(false);
   const [selectedCategory, setSelectedCategory] = useState("all");
   const [sortBy, setSortBy] = useState("default");
   const [priceRange, setPriceRange] = useState({ min: 0, max: 1000 });
 
-  // Fetch menu items from API
+  // Fetch menu items from API; a submitted search is run by the server
   useEffect(() => {
+    let cancelled = false;
     const loadMenuItems = async () => {
       try {
-        setLoading(true);
-        const data = await fetchMenuItems();
-        setMenuItems(data);
+        const data = await fetchMenuItems(searchQuery ? { search: searchQuery } : {});
+        if (!cancelled) setMenuItems(data);
       } catch (error) {
         console.error("Error loading menu items:", error);
       } finally {
-        setLoading(false);
+        if (!cancelled) setLoading(false);
       }
     };
     loadMenuItems();
-  }, []);
+    return () => {
+      cancelled = true;
+    };
+  }, [searchQuery]);
+
+  // Suggest names while typing, using the lightweight suggest endpoint
+  useEffect(() => {
+    const query = searchInput.trim();
+    if (query.length < 2 || query === searchQuery) {
+      setSuggestions({ items: [], categories: [] });
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      const data = await fetchMenuSuggestions(query);
+      if (!cancelled) setSuggestions(data);
+    }, 200);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchInput, searchQuery]);
 
   // Get unique categories
   const categories = useMemo(() => {
@@ -50,17 +74,6 @@ const Menu = () => {
   const filteredAndSortedItems = useMemo(() => {
     let result = [...menuItems];
 
-    // Filter by search query
-    if (searchQuery.trim()) {
-      const query = searchQuery.toLowerCase().trim();
-      result = result.filter(
-        (item) =>
-          item.name.toLowerCase().includes(query) ||
-          item.description.toLowerCase().includes(query) ||
-          item.category.toLowerCase().includes(query)
-      );
-    }
-
     // Filter by category
     if (selectedCategory !== "all") {
       result = result.filter((item) => item.category === selectedCategory);
@@ -94,7 +107,7 @@ const Menu = () => {
     }
 
     return result;
-  }, [menuItems, searchQuery, selectedCategory, sortBy, priceRange]);
+  }, [menuItems, selectedCategory, sortBy, priceRange]);
 
   const handleAddToCart = (item) => {
     addToCart(item);
@@ -105,7 +118,24 @@ const Menu = () => {
     navigate("/order-now", { state: { item } });
   };
 
+  const submitSearch = (query) => {
+    setSearchInput(query);
+    setSearchQuery(query.trim());
+    setShowSuggestions(false);
+  };
+
+  const handleSearchSubmit = (e) => {
+    e.preventDefault();
+    submitSearch(searchInput);
+  };
+
+  const selectCategorySuggestion = (category) => {
+    submitSearch("");
+    setSelectedCategory(category.slug);
+  };
+
   const clearFilters = () => {
+    setSearchInput("");
     setSearchQuery("");
     setSelectedCategory("all");
     setSortBy("default");
@@ -144,27 +174,67 @@ const Menu = () => {
       {/* Search and Filter Section */}
       <div className="menu-controls">
         {/* Search Bar */}
-        <div className="search-container">
+        <form className="search-container" onSubmit={handleSearchSubmit}>
           <div className="search-input-wrapper">
             <span className="search-icon">🔍</span>
             <input
               type="text"
               placeholder="Search dishes, ingredients..."
-              value={searchQuery}
-              onChange={(e) => setSearchQuery(e.target.value)}
+              value={searchInput}
+              onChange={(e) => {
+                setSearchInput(e.target.value);
+                setShowSuggestions(true);
+              }}
+              onFocus={() => setShowSuggestions(true)}
+              onBlur={() => setShowSuggestions(false)}
               className="search-input"
+              autoComplete="off"
             />
-            {searchQuery && (
+            {searchInput && (
               <button
+                type="button"
                 className="clear-search"
-                onClick={() => setSearchQuery("")}
+                onClick={() => submitSearch("")}
                 title="Clear search"
               >
                 ✕
               </button>
             )}
+            {showSuggestions &&
+              (suggestions.items.length > 0 || suggestions.categories.length > 0) && (
+                <ul className="search-suggestions">
+                  {suggestions.categories.map((category) => (
+                    <li key={`category-${category.id}`}>
+                      {/* onMouseDown so the pick lands before the input's blur */}
+                      <button
+                        type="button"
+                        onMouseDown={(e) => {
+                          e.preventDefault();
+                          selectCategorySuggestion(category);
+                        }}
+                      >
+                        <span className="suggestion-kind">Category</span>
+                        {category.name}
+                      </button>
+                    </li>
+                  ))}
+                  {suggestions.items.map((item) => (
+                    <li key={`item-${item.id}`}>
+                      <button
+                        type="button"
+                        onMouseDown={(e) => {
+                          e.preventDefault();
+                          submitSearch(item.name);
+                        }}
+                      >
+                        {item.name}
+                      </button>
+                    </li>
+                  ))}
+                </ul>
+              )}
           </div>
-        </div>
+        </form>
 
         {/* Filters Row */}
         <div className="filters-row">
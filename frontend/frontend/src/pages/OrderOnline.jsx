@@ -112,6 +112,7 @@ const OrderOnline = () => {
                     name: checkoutForm.name,
                     email: checkoutForm.email || checkoutForm.name + '@customer.com',
                     items: cart.map(item => ({
+                        id: item.id,
                         name: item.name,
                         description: item.description || item.name + ' - Delicious food item',
                         price: item.price,
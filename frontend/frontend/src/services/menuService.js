@@ -3,9 +3,10 @@ import api from './api';
 // Adjusted to avoid double '/api' since api.js baseURL already includes '/api'.
 const MENU_API_URL = '/menu/';
 
-export const fetchMenuItems = async () => {
+// Pass { search, category, sort } to have the server filter the menu
+export const fetchMenuItems = async (params = {}) => {
     try {
-        const response = await api.get(MENU_API_URL);
+        const response = await api.get(MENU_API_URL, { params });
         return response.data;
     } catch (error) {
         console.error('Error fetching menu items:', error);
@@ -29,6 +30,28 @@ export const fetchMenuItemById = async (id) => {
     }
 };
 
+// Categories (with item counts), featured items and the first menu page in one call
+export const fetchMenuBootstrap = async (limit = 20) => {
+    try {
+        const response = await api.get(`${MENU_API_URL}bootstrap/`, { params: { limit } });
+        return response.data;
+    } catch (error) {
+        console.error('Error fetching menu bootstrap:', error);
+        throw error;
+    }
+};
+
+// Lightweight search-as-you-type lookup; run the full menu search on submit
+export const fetchMenuSuggestions = async (query, limit = 8) => {
+    try {
+        const response = await api.get(`${MENU_API_URL}suggest/`, { params: { q: query, limit } });
+        return response.data;
+    } catch (error) {
+        console.error('Error fetching menu suggestions:', error);
+        return { items: [], categories: [] };
+    }
+};
+
 export const createMenuItem = async (menuItem) => {
     try {
         const response = await api.post(MENU_API_URL, menuItem);
@@ -1,5 +1,13 @@
 import api from './api';
 
+const FINAL_STATUSES = ['delivered', 'cancelled'];
+const LONG_POLL_SECONDS = 30;
+const RETRY_DELAY_MS = 5000;
+// The stream sends the order's state as soon as it opens; when nothing arrives
+// in this window something is buffering it, so long-poll instead. Servers
+// without streaming support answer 204, which closes the EventSource at once.
+const STREAM_TIMEOUT_MS = 5000;
+
 const orderService = {
     placeOrder: async (orderData) => {
         try {
@@ -19,13 +27,72 @@ const orderService = {
         }
     },
 
-    trackOrder: async (orderId) => {
+    // With { wait, version } the server holds the request until the order changes;
+    // resolves to null when it did not change in time (304)
+    trackOrder: async (orderId, params = {}) => {
         try {
-            const response = await api.get(`/orders/track/${orderId}/`);
-            return response.data;
+            const response = await api.get(`/orders/track/${orderId}/`, {
+                params,
+                validateStatus: (status) => status === 200 || status === 304,
+            });
+            return response.status === 304 ? null : response.data;
         } catch (error) {
             throw new Error('Error tracking order: ' + error.message);
         }
+    },
+
+    // Calls onUpdate with every state change; returns a function that stops watching.
+    // Uses the server-sent event stream and falls back to long-polling without it.
+    watchOrder: (orderId, onUpdate) => {
+        let timer = null;
+        let source = null;
+        let stopped = false;
+        let version = null;
+
+        const poll = async () => {
+            let delay = 0;
+            try {
+                const params = version === null ? {} : { wait: LONG_POLL_SECONDS, version };
+                const state = await orderService.trackOrder(orderId, params);
+                if (stopped) return;
+                if (state) {
+                    version = state.version;
+                    onUpdate(state);
+                    if (FINAL_STATUSES.includes(state.status)) return;
+                }
+            } catch (error) {
+                delay = RETRY_DELAY_MS; // keep polling through transient errors
+            }
+            if (!stopped) timer = setTimeout(poll, delay);
+        };
+
+        if (typeof EventSource === 'undefined') {
+            poll();
+        } else {
+            const fallBack = () => {
+                clearTimeout(timer);
+                source.close();
+                if (!stopped) poll();
+            };
+            source = new EventSource(`${api.defaults.baseURL}/orders/track/${orderId}/stream/`);
+            timer = setTimeout(fallBack, STREAM_TIMEOUT_MS);
+            source.addEventListener('status', (event) => {
+                clearTimeout(timer);
+                const state = JSON.parse(event.data);
+                version = state.version;
+                onUpdate(state);
+                if (FINAL_STATUSES.includes(state.status)) source.close();
+            });
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) fallBack();
+            };
+        }
+
+        return () => {
+            stopped = true;
+            if (source) source.close();
+            clearTimeout(timer);
+        };
     }
 };
 
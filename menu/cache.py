@@ -0,0 +1,71 @@
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max, Count
+from admin_panel.models import MenuItem, Category
+
+
+MENU_VERSION_KEY = 'menu:version'
+
+
+def get_menu_version():
+    """Return the current global menu version"""
+    version = cache.get(MENU_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a lost key never reuses an old version number
+        cache.add(MENU_VERSION_KEY, int(time.time() * 1000), None)
+        version = cache.get(MENU_VERSION_KEY)
+    return version
+
+
+def bump_menu_version():
+    """Invalidate every menu snapshot by moving to a new version"""
+    try:
+        return cache.incr(MENU_VERSION_KEY)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(MENU_VERSION_KEY, version, None)
+        return version
+
+
+def snapshot_key(name, params=None):
+    """Build the cache key of a snapshot for the current menu version"""
+    digest = hashlib.md5(
+        json.dumps(params or {}, sort_keys=True).encode()
+    ).hexdigest()
+    return f'menu:snapshot:{get_menu_version()}:{name}:{digest}'
+
+
+def get_snapshot(name, params, builder):
+    """Return pre-serialized JSON bytes, building them on a cache miss"""
+    key = snapshot_key(name, params)
+    content = cache.get(key)
+    if content is None:
+        content = json.dumps(builder(), cls=DjangoJSONEncoder).encode()
+        cache.set(key, content, settings.MENU_CACHE_TIMEOUT)
+    return content
+
+
+def get_menu_validator():
+    """Return the last modification time and row counts of the menu
+
+    Only aggregates are queried, and the result is cached for the current
+    menu version so unchanged menus are validated without touching rows.
+    """
+    key = f'menu:validator:{get_menu_version()}'
+    validator = cache.get(key)
+    if validator is None:
+        items = MenuItem.objects.aggregate(updated=Max('updated_at'), count=Count('id'))
+        categories = Category.objects.aggregate(updated=Max('updated_at'), count=Count('id'))
+        timestamps = [ts for ts in (items['updated'], categories['updated']) if ts]
+        last_modified = max(timestamps) if timestamps else None
+        validator = {
+            'last_modified': last_modified,
+            'tag': f"{items['count']}.{categories['count']}.{last_modified.timestamp() if last_modified else 0}",
+        }
+        cache.set(key, validator, settings.MENU_CACHE_TIMEOUT)
+    return validator
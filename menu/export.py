@@ -0,0 +1,111 @@
+import gzip
+import json
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from .cache import get_menu_validator
+from .payloads import build_categories_list, build_featured_items, build_full_menu_list
+
+
+# Exported documents: file name -> payload builder
+EXPORTS = {
+    'menu': build_full_menu_list,
+    'categories': build_categories_list,
+    'featured': build_featured_items,
+}
+
+MANIFEST = 'manifest.json'
+
+
+def export_dir():
+    return Path(settings.MEDIA_ROOT) / 'menu-export'
+
+
+def write_atomic(path, content):
+    """Write bytes to a temp file next to path and rename it into place"""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def write_menu_export(directory=None):
+    """Write the public menu documents as JSON plus precompressed .gz files
+
+    The manifest is written last and records the menu validator the files
+    were built from, so readers in any process can tell whether they are
+    current.
+    """
+    directory = Path(directory) if directory else export_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    tag = get_menu_validator()['tag']
+    written = []
+    for name, builder in EXPORTS.items():
+        content = json.dumps(builder(), cls=DjangoJSONEncoder).encode()
+        path = directory / f'{name}.json'
+        write_atomic(path, content)
+        write_atomic(directory / f'{name}.json.gz', gzip.compress(content, compresslevel=9, mtime=0))
+        written.append(path)
+
+    manifest = {'tag': tag, 'generated_at': timezone.now().isoformat()}
+    write_atomic(directory / MANIFEST, json.dumps(manifest).encode())
+    return written
+
+
+def accepts_gzip(request):
+    """Whether Accept-Encoding allows gzip, honouring q-values such as gzip;q=0"""
+    header = request.META.get('HTTP_ACCEPT_ENCODING', '')
+    qualities = {}
+    for entry in header.split(','):
+        coding, _, params = entry.partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(';'):
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    return qualities.get('gzip', qualities.get('*', 0.0)) > 0
+
+
+def export_is_current():
+    """Whether exports are served and were built from the current menu"""
+    if not settings.MENU_EXPORT_SERVE:
+        return False
+    try:
+        manifest = json.loads((export_dir() / MANIFEST).read_bytes())
+    except (OSError, ValueError):
+        return False
+    return isinstance(manifest, dict) and manifest.get('tag') == get_menu_validator()['tag']
+
+
+def read_menu_export(name, accept_gzip=False):
+    """Return (content, is_gzipped) of an exported document if it is current
+
+    Returns None when serving exports is disabled or the files were built
+    from an older state of the menu, so callers fall back to the database.
+    """
+    if not export_is_current():
+        return None
+    directory = export_dir()
+    try:
+        if accept_gzip:
+            return (directory / f'{name}.json.gz').read_bytes(), True
+        return (directory / f'{name}.json').read_bytes(), False
+    except OSError:
+        return None
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from admin_panel.models import MenuItem
+from menu.search import reindex_menu_items, search_supported
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the full-text search index for menu items'
+
+    def handle(self, *args, **options):
+        if not search_supported():
+            self.stdout.write(self.style.WARNING('This database has no full-text index; menu search uses LIKE queries.'))
+            return
+
+        self.stdout.write('Rebuilding menu search index...')
+        reindex_menu_items()
+        self.stdout.write(self.style.SUCCESS(f'Successfully indexed {MenuItem.objects.count()} menu items!'))
@@ -0,0 +1,48 @@
+from django.db import migrations
+
+
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE menu_search USING fts5("
+    "name, description, category, tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "INSERT INTO menu_search (rowid, name, description, category) "
+    "SELECT i.id, i.name, COALESCE(i.description, ''), COALESCE(c.name, '') "
+    "FROM admin_panel_menuitem i LEFT JOIN admin_panel_category c ON c.id = i.category_id",
+]
+
+POSTGRES_FORWARD = [
+    "CREATE TABLE menu_search ("
+    "item_id bigint PRIMARY KEY REFERENCES admin_panel_menuitem (id) ON DELETE CASCADE "
+    "DEFERRABLE INITIALLY DEFERRED, "
+    "document tsvector NOT NULL)",
+    "CREATE INDEX menu_search_document_idx ON menu_search USING GIN (document)",
+    "INSERT INTO menu_search (item_id, document) "
+    "SELECT i.id, setweight(to_tsvector('simple', i.name), 'A') "
+    "|| setweight(to_tsvector('simple', COALESCE(i.description, '')), 'B') "
+    "|| setweight(to_tsvector('simple', COALESCE(c.name, '')), 'C') "
+    "FROM admin_panel_menuitem i LEFT JOIN admin_panel_category c ON c.id = i.category_id",
+]
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    statements = {'sqlite': SQLITE_FORWARD, 'postgresql': POSTGRES_FORWARD}.get(vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute("DROP TABLE IF EXISTS menu_search")
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('admin_panel', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q, Count
+from admin_panel.models import MenuItem, Category
+from .search import search_menu_items
+
+
+# Output key -> (column fetched with .values(), converter)
+MENU_ITEM_FIELDS = {
+    'id': ('id', None),
+    'name': ('name', None),
+    'description': ('description', None),
+    'price': ('price', float),
+    'category': ('category__slug', lambda slug: slug or 'uncategorized'),
+    'category_name': ('category__name', lambda name: name or 'Uncategorized'),
+    'isVeg': ('is_veg', None),
+    'is_veg': ('is_veg', None),
+    'rating': ('rating', float),
+    'image': ('image', None),
+    'is_featured': ('is_featured', None),
+    'is_available': ('is_available', None),
+}
+
+
+# sort parameter -> (column, descending); ties are broken by id
+MENU_SORTS = {
+    'name': ('name', False),
+    'price': ('price', False),
+    'price_desc': ('price', True),
+    'rating': ('rating', True),
+}
+
+
+def encode_cursor(value, item_id):
+    """Opaque cursor pointing just after the given sort value and id"""
+    raw = json.dumps([value, item_id], cls=DjangoJSONEncoder)
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on a malformed cursor"""
+    try:
+        value, item_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return value, int(item_id)
+    except (TypeError, ValueError, binascii.Error) as e:
+        raise ValueError('Invalid cursor') from e
+
+
+def build_full_menu_list():
+    """Payload of menu_list without any query parameters"""
+    return build_menu_list('', '', '', list(MENU_ITEM_FIELDS))
+
+
+def build_menu_list(search, sort_by, category, fields, after=None, limit=None):
+    """Build the menu list payload from the database
+
+    With a limit, returns one page of results after the `after` cursor
+    position together with the cursor of the next page.
+    """
+    # Get menu items from database
+    queryset = MenuItem.objects.filter(is_available=True)
+    
+    # Filter by search, using the full-text index when the database has one
+    ranked = False
+    if search:
+        matches = search_menu_items(queryset, search)
+        if matches is None:
+            queryset = queryset.filter(name__icontains=search) | queryset.filter(description__icontains=search)
+        else:
+            queryset = matches
+            ranked = True
+    
+    # Filter by category
+    if category:
+        queryset = queryset.filter(Q(category__slug__iexact=category) | Q(category__name__iexact=category))
+    
+    # Search results without an explicit sort are ranked by relevance
+    by_relevance = ranked and not sort_by
+    sort_column, descending = MENU_SORTS.get(sort_by, MENU_SORTS['name'])
+
+    # Fetch only the columns behind the requested fields
+    columns = {MENU_ITEM_FIELDS[field][0] for field in fields} | {'id', sort_column}
+    if ranked:
+        columns.add('search_rank')
+
+    if by_relevance:
+        # Relevance cursors hold the position of the last item returned
+        start = 0
+        if after is not None:
+            try:
+                start = max(int(after[0]) + 1, 0)
+            except (TypeError, ValueError):
+                start = 0
+        rows = queryset.order_by('search_rank', 'id').values(*columns)
+        rows = rows[start:start + limit + 1] if limit is not None else rows[start:]
+        rows = list(rows)
+        ranking = {row['id']: start + position for position, row in enumerate(rows)}
+    else:
+        # Sort, with id as a stable tiebreaker for keyset paging
+        prefix = '-' if descending else ''
+        queryset = queryset.order_by(f'{prefix}{sort_column}', f'{prefix}id')
+        if after is not None:
+            value, item_id = after
+            if descending:
+                queryset = queryset.filter(Q(**{f'{sort_column}__lt': value}) | Q(**{sort_column: value, 'id__lt': item_id}))
+            else:
+                queryset = queryset.filter(Q(**{f'{sort_column}__gt': value}) | Q(**{sort_column: value, 'id__gt': item_id}))
+        rows = queryset.values(*columns)
+        if limit is not None:
+            rows = rows[:limit + 1]
+        rows = list(rows)
+
+    next_cursor = None
+    if limit is not None and len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(ranking[last['id']] if by_relevance else last[sort_column], last['id'])
+
+    items = []
+    for row in rows:
+        item = {}
+        for field in fields:
+            column, convert = MENU_ITEM_FIELDS[field]
+            item[field] = convert(row[column]) if convert else row[column]
+        items.append(item)
+    
+    if limit is None:
+        return items
+    return {'results': items, 'next_cursor': next_cursor}
+
+
+def menu_item_payload(item):
+    """Full public representation of a menu item with its category loaded"""
+    return {
+        'id': item.id,
+        'name': item.name,
+        'description': item.description,
+        'price': float(item.price),
+        'category': item.category.slug if item.category else 'uncategorized',
+        'category_name': item.category.name if item.category else 'Uncategorized',
+        'isVeg': item.is_veg,
+        'is_veg': item.is_veg,
+        'rating': float(item.rating),
+        'image': item.image,
+        'is_featured': item.is_featured,
+        'is_available': item.is_available
+    }
+
+
+def build_categories_list(with_counts=False):
+    """Build the categories payload from the database
+
+    With with_counts, each category also carries the number of available
+    items, counted in the same query.
+    """
+    categories = Category.objects.filter(is_active=True).order_by('name')
+    if with_counts:
+        categories = categories.annotate(item_count=Count('items', filter=Q(items__is_available=True)))
+    data = []
+    for cat in categories:
+        entry = {
+            'id': cat.id,
+            'name': cat.name,
+            'slug': cat.slug,
+            'description': cat.description,
+            'image': cat.image
+        }
+        if with_counts:
+            entry['item_count'] = cat.item_count
+        data.append(entry)
+    return data
+
+
+def build_featured_items():
+    """Build the featured items payload from the database"""
+    items = MenuItem.objects.filter(is_available=True, is_featured=True).select_related('category')[:8]
+    data = []
+    for item in items:
+        data.append({
+            'id': item.id,
+            'name': item.name,
+            'description': item.description,
+            'price': float(item.price),
+            'category': item.category.slug if item.category else 'uncategorized',
+            'isVeg': item.is_veg,
+            'rating': float(item.rating),
+            'image': item.image
+        })
+    return data
+
+
+def build_bootstrap(limit):
+    """Build the home page payload from the database"""
+    return {
+        'categories': build_categories_list(with_counts=True),
+        'featured': build_featured_items(),
+        'menu': build_menu_list('', '', '', list(MENU_ITEM_FIELDS), limit=limit),
+    }
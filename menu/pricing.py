@@ -0,0 +1,116 @@
+import threading
+import time
+from collections import namedtuple
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db.models import Count, Max
+from admin_panel.models import MenuItem
+from .cache import get_menu_version
+
+
+TAX_RATE = Decimal('0.05')
+DELIVERY_FEE = Decimal('150.00')
+CENTS = Decimal('0.01')
+
+PriceEntry = namedtuple('PriceEntry', ['price', 'is_available', 'name'])
+
+
+class PricingError(ValueError):
+    """Raised when an order line cannot be priced"""
+
+
+PriceTable = namedtuple('PriceTable', ['version', 'signature', 'checked_at', 'prices'])
+
+_lock = threading.Lock()
+_current = PriceTable(None, None, float('-inf'), None)
+
+
+def build_price_table():
+    """Map every menu item id to its current price, availability and name"""
+    rows = MenuItem.objects.values_list('id', 'price', 'is_available', 'name')
+    return {pk: PriceEntry(price, is_available, name) for pk, price, is_available, name in rows}
+
+
+def price_table_signature():
+    """Latest updated_at and row count of the menu items, read from the database"""
+    stats = MenuItem.objects.aggregate(updated=Max('updated_at'), count=Count('id'))
+    return stats['updated'], stats['count']
+
+
+def get_price_table():
+    """Return the price table, rebuilding it after any menu change
+
+    A local menu version bump is seen at once. Changes made by other
+    processes are caught by re-checking the database signature at most
+    every PRICE_TABLE_MAX_AGE seconds, so a per-process cache can never
+    keep old prices around for long.
+    """
+    global _current
+    version = get_menu_version()
+    current = _current
+    if current.version == version and time.monotonic() - current.checked_at < settings.PRICE_TABLE_MAX_AGE:
+        return current.prices
+    with _lock:
+        current = _current
+        now = time.monotonic()
+        if current.version == version and now - current.checked_at < settings.PRICE_TABLE_MAX_AGE:
+            return current.prices
+        signature = price_table_signature()
+        if current.version == version and current.signature == signature:
+            prices = current.prices
+        else:
+            prices = build_price_table()
+        _current = PriceTable(version, signature, now, prices)
+        return prices
+
+
+def resolve_lines(items):
+    """Price client cart lines from the menu instead of the prices they carry
+
+    Each item needs an id (or menu_item_id) of an available menu item and a
+    positive quantity. Returns a list of dicts with menu_item_id, name,
+    price and quantity; raises PricingError for the first bad line.
+    """
+    if not isinstance(items, (list, tuple)):
+        raise PricingError('Items must be a list')
+    table = get_price_table()
+    lines = []
+    for item in items:
+        if not isinstance(item, dict):
+            raise PricingError('Each item must be an object')
+        item_id = item.get('id') or item.get('menu_item_id')
+        try:
+            entry = table.get(int(item_id))
+        except (TypeError, ValueError):
+            entry = None
+        if entry is None:
+            raise PricingError(f'Unknown menu item: {item.get("name") or item_id}')
+        if not entry.is_available:
+            raise PricingError(f'{entry.name} is currently unavailable')
+        try:
+            quantity = int(item.get('quantity', 1))
+        except (TypeError, ValueError):
+            quantity = 0
+        if quantity < 1:
+            raise PricingError(f'Invalid quantity for {entry.name}')
+        lines.append({
+            'menu_item_id': int(item_id),
+            'name': entry.name,
+            'price': entry.price,
+            'quantity': quantity,
+        })
+    return lines
+
+
+def price_order(lines, order_type):
+    """Subtotal, 5% tax, delivery fee and total for resolved lines"""
+    subtotal = sum((line['price'] * line['quantity'] for line in lines), Decimal('0.00'))
+    tax = (subtotal * TAX_RATE).quantize(CENTS, rounding=ROUND_HALF_UP)
+    delivery_fee = DELIVERY_FEE if order_type == 'delivery' else Decimal('0.00')
+    return {
+        'subtotal': subtotal,
+        'tax': tax,
+        'delivery_fee': delivery_fee,
+        'total': subtotal + tax + delivery_fee,
+    }
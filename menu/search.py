@@ -0,0 +1,117 @@
+import re
+
+from django.db import connection, transaction
+from admin_panel.models import MenuItem, Category
+
+
+# Name of the full-text index table created by menu/migrations/0001
+SEARCH_TABLE = 'menu_search'
+
+# Relevance weights for the name, description and category columns
+SQLITE_WEIGHTS = (10.0, 1.0, 4.0)
+
+
+def search_supported():
+    """Whether the database backend has a full-text index for the menu"""
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def tokenize(query):
+    """Split a search query into lower-case word tokens"""
+    return re.findall(r'\w+', query.lower())
+
+
+def search_menu_items(queryset, query):
+    """Narrow a MenuItem queryset to items matching the query
+
+    Every token must match, and each one matches as a word prefix so
+    partially typed words still find results. The index is joined in the
+    same query and adds a search_rank column, lower ranks being more
+    relevant. Returns None when the database has no full-text index so
+    callers can fall back to LIKE.
+    """
+    if not search_supported():
+        return None
+
+    tokens = tokenize(query)
+    if not tokens:
+        return queryset.extra(select={'search_rank': '0'}).none()
+
+    # extra() because the ORM cannot join a table that has no model
+    items_table = queryset.model._meta.db_table
+    if connection.vendor == 'sqlite':
+        weights = ', '.join(str(weight) for weight in SQLITE_WEIGHTS)
+        return queryset.extra(
+            select={'search_rank': f'bm25({SEARCH_TABLE}, {weights})'},
+            tables=[SEARCH_TABLE],
+            where=[f'{SEARCH_TABLE}.rowid = {items_table}.id', f'{SEARCH_TABLE} MATCH %s'],
+            params=[' '.join(f'"{token}"*' for token in tokens)],
+        )
+    tsquery = ' & '.join(f'{token}:*' for token in tokens)
+    return queryset.extra(
+        select={'search_rank': f"-ts_rank({SEARCH_TABLE}.document, to_tsquery('simple', %s))"},
+        select_params=[tsquery],
+        tables=[SEARCH_TABLE],
+        where=[
+            f'{SEARCH_TABLE}.item_id = {items_table}.id',
+            f"{SEARCH_TABLE}.document @@ to_tsquery('simple', %s)",
+        ],
+        params=[tsquery],
+    )
+
+
+def reindex_menu_items(ids=None):
+    """Rebuild index entries for the given menu item ids, or for all items
+
+    Entries are rebuilt from the stored rows in a single statement, so this
+    works the same for one saved item and for a full bulk rebuild.
+    """
+    if not search_supported():
+        return
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+
+    items_table = MenuItem._meta.db_table
+    categories_table = Category._meta.db_table
+    id_column = 'rowid' if connection.vendor == 'sqlite' else 'item_id'
+
+    where = ''
+    params = []
+    delete_sql = f'DELETE FROM {SEARCH_TABLE}'
+    if ids is not None:
+        placeholders = ', '.join(['%s'] * len(ids))
+        where = f' WHERE i.id IN ({placeholders})'
+        delete_sql += f' WHERE {id_column} IN ({placeholders})'
+        params = ids
+
+    if connection.vendor == 'sqlite':
+        insert_sql = (
+            f'INSERT INTO {SEARCH_TABLE} (rowid, name, description, category) '
+            f"SELECT i.id, i.name, COALESCE(i.description, ''), COALESCE(c.name, '') "
+            f'FROM {items_table} i LEFT JOIN {categories_table} c ON c.id = i.category_id'
+        )
+    else:
+        insert_sql = (
+            f'INSERT INTO {SEARCH_TABLE} (item_id, document) '
+            f"SELECT i.id, setweight(to_tsvector('simple', i.name), 'A') "
+            f"|| setweight(to_tsvector('simple', COALESCE(i.description, '')), 'B') "
+            f"|| setweight(to_tsvector('simple', COALESCE(c.name, '')), 'C') "
+            f'FROM {items_table} i LEFT JOIN {categories_table} c ON c.id = i.category_id'
+        )
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(delete_sql, params)
+        cursor.execute(insert_sql + where, params)
+
+
+def remove_menu_items(ids):
+    """Drop index entries for deleted menu items"""
+    ids = list(ids)
+    if not search_supported() or not ids:
+        return
+    id_column = 'rowid' if connection.vendor == 'sqlite' else 'item_id'
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {SEARCH_TABLE} WHERE {id_column} IN ({placeholders})', ids)
@@ -0,0 +1,75 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from admin_panel.models import MenuItem, Category, MenuTombstone
+from .cache import bump_menu_version
+from .search import reindex_menu_items, remove_menu_items
+from .export import write_menu_export
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_menu_cache(sender, **kwargs):
+    """Bump the menu version once the change is committed"""
+    transaction.on_commit(bump_menu_version)
+
+
+@receiver(post_save, sender=MenuItem)
+def index_menu_item(sender, instance, **kwargs):
+    """Keep the search index entry of a saved item up to date"""
+    reindex_menu_items([instance.pk])
+
+
+@receiver(post_delete, sender=MenuItem)
+def unindex_menu_item(sender, instance, **kwargs):
+    """Remove a deleted item from the search index"""
+    remove_menu_items([instance.pk])
+
+
+@receiver(post_save, sender=Category)
+def index_category_items(sender, instance, created, **kwargs):
+    """Category names are searchable, so reindex the items of a saved category"""
+    if not created:
+        reindex_menu_items(instance.items.values_list('id', flat=True))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_category_items(sender, instance, **kwargs):
+    """Note the items of a category before deletion detaches them"""
+    instance._search_item_ids = list(instance.items.values_list('id', flat=True))
+
+
+@receiver(post_save, sender=Category)
+@receiver(pre_delete, sender=Category)
+def touch_category_items(sender, instance, created=False, **kwargs):
+    """Items carry their category's name and slug, so move them into the changes feed"""
+    if not created:
+        instance.items.update(updated_at=timezone.now())
+
+
+@receiver(post_delete, sender=Category)
+def index_detached_items(sender, instance, **kwargs):
+    """Reindex items that lost their category"""
+    reindex_menu_items(getattr(instance, '_search_item_ids', []))
+
+
+@receiver(post_save, sender=MenuItem)
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def regenerate_menu_export(sender, **kwargs):
+    """Rewrite the static menu export after a committed change, if enabled"""
+    if settings.MENU_EXPORT_ON_SAVE:
+        transaction.on_commit(write_menu_export)
+
+
+@receiver(post_delete, sender=MenuItem)
+@receiver(post_delete, sender=Category)
+def record_menu_tombstone(sender, instance, **kwargs):
+    """Leave a tombstone so incremental sync clients learn about deletions"""
+    kind = 'item' if sender is MenuItem else 'category'
+    MenuTombstone.objects.create(kind=kind, object_id=instance.pk)
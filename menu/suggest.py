@@ -0,0 +1,92 @@
+import threading
+import unicodedata
+from bisect import bisect_left
+
+from admin_panel.models import MenuItem, Category
+from .cache import get_menu_version
+
+
+def normalize(text):
+    """Lower-case text and strip accents so 'Crème' matches 'creme'"""
+    decomposed = unicodedata.normalize('NFKD', text or '')
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).lower().strip()
+
+
+class PrefixIndex:
+    """Sorted array of normalized names searched with bisect
+
+    Every name is indexed once in full and once per later word, so 'chi'
+    finds both 'Chilli Chicken' and 'Butter Chicken'. Full-name matches are
+    returned before word matches.
+    """
+
+    def __init__(self, entries):
+        # entries: iterable of (name, payload) where payload is a dict
+        names = []
+        words = []
+        for position, (name, payload) in enumerate(entries):
+            key = normalize(name)
+            names.append((key, position, payload))
+            parts = key.split()
+            for index in range(1, len(parts)):
+                words.append((' '.join(parts[index:]), position, payload))
+        names.sort(key=lambda entry: entry[:2])
+        words.sort(key=lambda entry: entry[:2])
+        self._names = names
+        self._name_keys = [entry[0] for entry in names]
+        self._words = words
+        self._word_keys = [entry[0] for entry in words]
+
+    def lookup(self, prefix, limit):
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        results = []
+        seen = set()
+        for keys, entries in ((self._name_keys, self._names), (self._word_keys, self._words)):
+            index = bisect_left(keys, prefix)
+            while index < len(entries) and len(results) < limit:
+                key, position, payload = entries[index]
+                if not key.startswith(prefix):
+                    break
+                index += 1
+                if position not in seen:
+                    seen.add(position)
+                    results.append(payload)
+        return results
+
+
+_lock = threading.Lock()
+_current = (None, None)
+
+
+def build_indexes():
+    """Load available items and active categories into prefix indexes"""
+    items = MenuItem.objects.filter(is_available=True).values_list('id', 'name')
+    categories = Category.objects.filter(is_active=True).values_list('id', 'name', 'slug')
+    return {
+        'items': PrefixIndex((name, {'id': pk, 'name': name}) for pk, name in items),
+        'categories': PrefixIndex(
+            (name, {'id': pk, 'name': name, 'slug': slug}) for pk, name, slug in categories
+        ),
+    }
+
+
+def get_indexes():
+    """Return the prefix indexes, rebuilding them after any menu change"""
+    global _current
+    version = get_menu_version()
+    if _current[0] != version:
+        with _lock:
+            if _current[0] != version:
+                _current = (version, build_indexes())
+    return _current[1]
+
+
+def suggest(query, limit):
+    """Top matching item and category names for a typed prefix"""
+    indexes = get_indexes()
+    return {
+        'items': indexes['items'].lookup(query, limit),
+        'categories': indexes['categories'].lookup(query, limit),
+    }
@@ -1,3 +1,261 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from admin_panel.models import Category, MenuItem, MenuTombstone
+from .urls import decode_changes_cursor, encode_changes_cursor
+
+
+class MenuTestCase(TestCase):
+    """A small menu plus an admin client whose writes run their on_commit hooks"""
+
+    def setUp(self):
+        cache.clear()
+        self.mains = Category.objects.create(name='Mains', slug='mains')
+        self.drinks = Category.objects.create(name='Drinks', slug='drinks')
+        self.burger = MenuItem.objects.create(
+            name='Chicken Burger', description='Grilled chicken in a bun', price=Decimal('500.00'),
+            category=self.mains, is_featured=True, rating=Decimal('4.5'),
+        )
+        self.karahi = MenuItem.objects.create(
+            name='Chicken Karahi', description='Spicy wok curry', price=Decimal('1200.00'),
+            category=self.mains, rating=Decimal('4.8'),
+        )
+        self.tea = MenuItem.objects.create(
+            name='Green Tea', description='Hot tea', price=Decimal('150.00'),
+            category=self.drinks, rating=Decimal('4.0'),
+        )
+        self.admin = APIClient()
+        self.admin.force_authenticate(User.objects.create_user('admin', 'admin@example.com', 'pw', is_staff=True))
+
+    def admin_request(self, method, url, data=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return getattr(self.admin, method)(url, data, format='json')
+
+
+class MenuSnapshotTests(MenuTestCase):
+    """Cached menu snapshots never outlive an admin edit"""
+
+    def names(self, url):
+        return sorted(item['name'] for item in self.client.get(url).json())
+
+    def test_edits_show_up_on_the_next_read(self):
+        # Warm every snapshot first
+        self.assertEqual(self.names('/api/menu/'), ['Chicken Burger', 'Chicken Karahi', 'Green Tea'])
+        self.assertEqual(self.names('/api/menu/featured/'), ['Chicken Burger'])
+        self.assertEqual(self.names('/api/menu/categories/'), ['Drinks', 'Mains'])
+
+        self.admin_request('put', f'/api/admin-panel/menu/{self.burger.id}/', {'name': 'Zinger Burger', 'price': '550.00'})
+        menu = {item['id']: item for item in self.client.get('/api/menu/').json()}
+        self.assertEqual((menu[self.burger.id]['name'], menu[self.burger.id]['price']), ('Zinger Burger', 550.0))
+        self.assertEqual(self.names('/api/menu/featured/'), ['Zinger Burger'])
+
+        self.admin_request('delete', f'/api/admin-panel/menu/{self.burger.id}/')
+        self.assertEqual(self.names('/api/menu/'), ['Chicken Karahi', 'Green Tea'])
+        self.assertEqual(self.names('/api/menu/featured/'), [])
+
+        self.admin_request('put', f'/api/admin-panel/categories/{self.drinks.id}/', {'name': 'Beverages'})
+        self.assertEqual(self.names('/api/menu/categories/'), ['Beverages', 'Mains'])
+
+
+class ConditionalGetTests(MenuTestCase):
+    """Menu reads answer If-None-Match / If-Modified-Since with 304 until the menu changes"""
+
+    def test_matching_etag_gets_304(self):
+        for url in ('/api/menu/', '/api/menu/categories/', f'/api/menu/{self.tea.id}/'):
+            etag = self.client.get(url)['ETag']
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, url)
+
+    def test_edit_changes_the_etag(self):
+        first = self.client.get('/api/menu/')
+        self.admin_request('put', f'/api/admin-panel/menu/{self.tea.id}/', {'price': '175.00'})
+        second = self.client.get('/api/menu/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second['ETag'], first['ETag'])
+        self.assertEqual(self.client.get('/api/menu/', HTTP_IF_NONE_MATCH=second['ETag']).status_code, 304)
+
+    def test_query_parameters_have_their_own_etag(self):
+        self.assertNotEqual(self.client.get('/api/menu/')['ETag'], self.client.get('/api/menu/?sort=price')['ETag'])
+
+
+class MenuSearchTests(MenuTestCase):
+    """menu_list ?search= runs on the full-text index, kept in sync by signals"""
+
+    def search(self, query, **params):
+        return [item['name'] for item in self.client.get('/api/menu/', {'search': query, **params}).json()]
+
+    def test_prefixes_of_every_token_must_match(self):
+        self.assertEqual(sorted(self.search('chick')), ['Chicken Burger', 'Chicken Karahi'])
+        self.assertEqual(self.search('chick kara'), ['Chicken Karahi'])
+        self.assertEqual(self.search('!!!'), [])
+
+    def test_results_are_ranked(self):
+        MenuItem.objects.create(name='Grilled Fish', description='Fresh fish', price=Decimal('900.00'), category=self.mains)
+        # A name match outranks a description match
+        self.assertEqual(self.search('grilled'), ['Grilled Fish', 'Chicken Burger'])
+        # An explicit sort wins over relevance
+        self.assertEqual(self.search('grilled', sort='price'), ['Chicken Burger', 'Grilled Fish'])
+
+    def test_relevance_pages_cover_every_match_once(self):
+        for n in range(5):
+            MenuItem.objects.create(name=f'Chicken Roll {n}', description='Roll', price=Decimal('300.00'))
+        everything = self.search('chicken')
+        seen, cursor = [], None
+        while True:
+            params = {'search': 'chicken', 'limit': 2, **({'cursor': cursor} if cursor else {})}
+            page = self.client.get('/api/menu/', params).json()
+            seen += [item['name'] for item in page['results']]
+            cursor = page['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, everything)
+        self.assertEqual(len(seen), 7)
+
+    def test_index_follows_item_saves_and_deletes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tea.name = 'Mint Tea'
+            self.tea.save()
+        self.assertEqual(self.search('mint'), ['Mint Tea'])
+        self.assertEqual(self.search('green'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tea.delete()
+        self.assertEqual(self.search('mint'), [])
+
+    def test_index_follows_category_renames_and_deletes(self):
+        self.assertEqual(self.search('drinks'), ['Green Tea'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drinks.name = 'Beverages'
+            self.drinks.save()
+        self.assertEqual(self.search('beverages'), ['Green Tea'])
+        self.assertEqual(self.search('drinks'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.drinks.delete()
+        self.assertEqual(self.search('beverages'), [])
+        self.assertEqual(self.search('green'), ['Green Tea'])
+
+
+class MenuPagingTests(MenuTestCase):
+    """Opt-in keyset paging and ?fields= leave the plain menu_list response alone"""
+
+    def test_plain_response_is_unchanged(self):
+        response = self.client.get('/api/menu/').json()
+        self.assertEqual([item['name'] for item in response], ['Chicken Burger', 'Chicken Karahi', 'Green Tea'])
+        self.assertEqual(response[0], {
+            'id': self.burger.id, 'name': 'Chicken Burger', 'description': 'Grilled chicken in a bun',
+            'price': 500.0, 'category': 'mains', 'category_name': 'Mains', 'isVeg': False, 'is_veg': False,
+            'rating': 4.5, 'image': None, 'is_featured': True, 'is_available': True,
+        })
+
+    def test_fields_limit_the_keys(self):
+        response = self.client.get('/api/menu/', {'fields': 'id,price'}).json()
+        self.assertEqual(response[0], {'id': self.burger.id, 'price': 500.0})
+        self.assertEqual(self.client.get('/api/menu/', {'fields': 'id,secret'}).status_code, 400)
+
+    def test_cursor_pages_cover_every_sort_without_repeats(self):
+        # Equal prices and ratings make the id tiebreaker matter
+        for n in range(7):
+            MenuItem.objects.create(
+                name=f'Item {n}', description='Item', price=Decimal('150.00') if n % 2 else Decimal('500.00'),
+                rating=Decimal('4.0'), category=self.drinks,
+            )
+        for sort in ('', 'name', 'price', 'price_desc', 'rating'):
+            expected = [item['id'] for item in self.client.get('/api/menu/', {'sort': sort}).json()]
+            seen, cursor = [], None
+            while True:
+                params = {'sort': sort, 'limit': 3, 'fields': 'id', **({'cursor': cursor} if cursor else {})}
+                page = self.client.get('/api/menu/', params).json()
+                seen += [item['id'] for item in page['results']]
+                cursor = page['next_cursor']
+                if not cursor:
+                    break
+            self.assertEqual(seen, expected, sort)
+            self.assertEqual(len(set(seen)), 10, sort)
+
+    def test_bad_cursor_is_rejected(self):
+        self.assertEqual(self.client.get('/api/menu/', {'cursor': 'nope'}).status_code, 400)
+
+
+class MenuBatchTests(MenuTestCase):
+    def test_found_and_missing_ids(self):
+        response = self.client.get('/api/menu/batch/', {'ids': f'{self.tea.id},999999,{self.burger.id},{self.tea.id}'}).json()
+        self.assertEqual(sorted(response['items']), sorted([str(self.tea.id), str(self.burger.id)]))
+        self.assertEqual(response['items'][str(self.tea.id)]['name'], 'Green Tea')
+        self.assertEqual(response['missing'], [999999])
+
+    def test_post_body_and_bad_ids(self):
+        response = self.client.post('/api/menu/batch/', {'ids': [self.karahi.id, 424242]}, content_type='application/json')
+        self.assertEqual(response.json()['missing'], [424242])
+        self.assertEqual(self.client.get('/api/menu/batch/', {'ids': 'a,b'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/menu/batch/').status_code, 400)
+
+
+class MenuChangesTests(MenuTestCase):
+    """The /api/menu/changes/ delta feed"""
+
+    def changes(self, cursor=None):
+        return self.client.get('/api/menu/changes/', {'since': cursor} if cursor else {}).json()
+
+    def test_first_call_is_a_full_listing(self):
+        feed = self.changes()
+        self.assertTrue(feed['full'])
+        self.assertEqual(len(feed['items']), 3)
+        self.assertEqual(len(feed['categories']), 2)
+
+    def test_deletes_leave_tombstones(self):
+        cursor = self.changes()['cursor']
+        tea_id = self.tea.id
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tea.delete()
+        feed = self.changes(cursor)
+        self.assertFalse(feed['full'])
+        self.assertEqual(feed['deleted']['items'], [tea_id])
+
+    def test_category_renames_and_deletes_resend_their_items(self):
+        cursor = self.changes()['cursor']
+        drinks_id = self.drinks.id
+        with self.settings(MENU_CHANGES_OVERLAP=0):
+            with self.captureOnCommitCallbacks(execute=True):
+                self.drinks.name = 'Beverages'
+                self.drinks.save()
+            feed = self.changes(cursor)
+            self.assertEqual([(item['id'], item['category_name']) for item in feed['items']], [(self.tea.id, 'Beverages')])
+
+            cursor = feed['cursor']
+            with self.captureOnCommitCallbacks(execute=True):
+                self.drinks.delete()
+            feed = self.changes(cursor)
+            self.assertEqual([(item['id'], item['category']) for item in feed['items']], [(self.tea.id, 'uncategorized')])
+            self.assertEqual(feed['deleted']['categories'], [drinks_id])
+
+    def test_rows_committed_behind_the_cursor_are_resent(self):
+        cursor = self.changes()['cursor']
+        moment = decode_changes_cursor(cursor)
+        # A slow transaction stamped this row before the cursor but committed after it
+        MenuItem.objects.filter(pk=self.tea.pk).update(name='Late Tea', updated_at=moment - timedelta(seconds=10))
+        feed = self.changes(cursor)
+        self.assertEqual([item['name'] for item in feed['items'] if item['id'] == self.tea.id], ['Late Tea'])
+        self.assertGreaterEqual(decode_changes_cursor(feed['cursor']), moment)
+        with self.settings(MENU_CHANGES_OVERLAP=5):
+            self.assertNotIn(self.tea.id, [item['id'] for item in self.changes(cursor)['items']])
+
+    def test_cursors_older_than_the_tombstone_retention_get_a_full_resync(self):
+        old = encode_changes_cursor(timezone.now() - timedelta(seconds=settings.MENU_TOMBSTONE_RETENTION + 60))
+        feed = self.changes(old)
+        self.assertTrue(feed['full'])
+        self.assertEqual(len(feed['items']), 3)
 
-# Create your tests here.
+    def test_expired_tombstones_are_purged(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.tea.delete()
+        MenuTombstone.objects.update(deleted_at=timezone.now() - timedelta(seconds=settings.MENU_TOMBSTONE_RETENTION + 1))
+        call_command('purge_menu_tombstones', stdout=StringIO())
+        self.assertFalse(MenuTombstone.objects.exists())
@@ -1,113 +1,272 @@
 from django.urls import path
-from django.http import JsonResponse
-from admin_panel.models import MenuItem, Category
+from django.http import JsonResponse, HttpResponse
+from django.views.decorators.http import condition, require_http_methods
+from django.views.decorators.csrf import csrf_exempt
+from django.utils.cache import patch_vary_headers
+from django.conf import settings
+from django.utils import timezone
+from datetime import datetime, timedelta, timezone as dt_timezone
+import hashlib
+import json
+from admin_panel.models import MenuItem, Category, MenuTombstone
+from .cache import get_snapshot, get_menu_validator
+from .payloads import (
+    MENU_ITEM_FIELDS, build_bootstrap, build_categories_list, build_featured_items,
+    build_menu_list, decode_cursor, menu_item_payload,
+)
+from .suggest import suggest
+from .export import accepts_gzip, export_is_current, read_menu_export
 
 
+def menu_etag(request, *args, **kwargs):
+    """ETag built from the menu validator, the path and the query parameters"""
+    validator = get_menu_validator()
+    raw = f"{validator['tag']}|{request.path}|{sorted(request.GET.lists())}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def export_etag(request, *args, **kwargs):
+    """menu_etag, with a -gzip suffix when a gzipped export will be served"""
+    etag = menu_etag(request, *args, **kwargs)
+    if not request.GET and accepts_gzip(request) and export_is_current():
+        etag += '-gzip'
+    return etag
+
+
+def menu_last_modified(request, *args, **kwargs):
+    """Latest updated_at across menu items and categories"""
+    return get_menu_validator()['last_modified']
+
+
+menu_conditional = condition(etag_func=menu_etag, last_modified_func=menu_last_modified)
+export_conditional = condition(etag_func=export_etag, last_modified_func=menu_last_modified)
+
+
+def snapshot_response(name, params, builder):
+    """Serve a cached menu snapshot as a JSON response"""
+    return HttpResponse(get_snapshot(name, params, builder), content_type='application/json')
+
+
+def export_response(request, name):
+    """Serve a current static menu export straight from disk, if enabled
+
+    Only requests without query parameters are answered from the export.
+    """
+    if request.GET:
+        return None
+    export = read_menu_export(name, accepts_gzip(request))
+    if export is None:
+        return None
+    content, gzipped = export
+    response = HttpResponse(content, content_type='application/json')
+    patch_vary_headers(response, ['Accept-Encoding'])
+    if gzipped:
+        response['Content-Encoding'] = 'gzip'
+    return response
+
+
+MAX_PAGE_SIZE = 100
+
+
+@export_conditional
 def menu_list(request):
-    """Get all menu items with optional search and sorting"""
-    search = request.GET.get('search', '').lower()
-    sort_by = request.GET.get('sort', 'name')
-    category = request.GET.get('category', '')
-    
-    # Get menu items from database
-    queryset = MenuItem.objects.filter(is_available=True).select_related('category')
-    
-    # Filter by search
-    if search:
-        queryset = queryset.filter(name__icontains=search) | queryset.filter(description__icontains=search)
-    
-    # Filter by category
-    if category:
-        queryset = queryset.filter(category__slug__iexact=category) | queryset.filter(category__name__iexact=category)
-    
-    # Sort
-    if sort_by == 'price':
-        queryset = queryset.order_by('price')
-    elif sort_by == 'price_desc':
-        queryset = queryset.order_by('-price')
-    elif sort_by == 'rating':
-        queryset = queryset.order_by('-rating')
-    else:
-        queryset = queryset.order_by('name')
-    
-    items = []
-    for item in queryset:
-        items.append({
-            'id': item.id,
-            'name': item.name,
-            'description': item.description,
-            'price': float(item.price),
-            'category': item.category.slug if item.category else 'uncategorized',
-            'category_name': item.category.name if item.category else 'Uncategorized',
-            'isVeg': item.is_veg,
-            'is_veg': item.is_veg,
-            'rating': float(item.rating),
-            'image': item.image,
-            'is_featured': item.is_featured,
-            'is_available': item.is_available
-        })
-    
-    return JsonResponse(items, safe=False)
+    """Get all menu items with optional search, sorting, paging and field selection
+
+    Pass ?limit= and/or ?cursor= to get keyset-paginated results wrapped in
+    {"results": [...], "next_cursor": ...}; pass ?fields=id,name,... to
+    receive only those keys. Without them the full list is returned as before.
+    """
+    response = export_response(request, 'menu')
+    if response is not None:
+        return response
+
+    fields = request.GET.get('fields', '')
+    fields = [field.strip() for field in fields.split(',') if field.strip()] if fields else list(MENU_ITEM_FIELDS)
+    unknown = [field for field in fields if field not in MENU_ITEM_FIELDS]
+    if unknown:
+        return JsonResponse({'error': f"Unknown fields: {', '.join(unknown)}"}, status=400)
+
+    cursor = request.GET.get('cursor')
+    limit = request.GET.get('limit')
+    paginate = cursor is not None or limit is not None
+    try:
+        limit = min(max(int(limit or 20), 1), MAX_PAGE_SIZE)
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        return JsonResponse({'error': 'Invalid cursor or limit'}, status=400)
+
+    params = {
+        'search': request.GET.get('search', '').lower(),
+        'sort_by': request.GET.get('sort', ''),
+        'category': request.GET.get('category', ''),
+        'fields': fields,
+        'after': after if paginate else None,
+        'limit': limit if paginate else None,
+    }
+    return snapshot_response('menu_list', params, lambda: build_menu_list(**params))
 
 
+@menu_conditional
 def menu_detail(request, item_id):
     """Get single menu item by ID"""
     try:
         item = MenuItem.objects.select_related('category').get(id=item_id)
-        return JsonResponse({
-            'id': item.id,
-            'name': item.name,
-            'description': item.description,
-            'price': float(item.price),
-            'category': item.category.slug if item.category else 'uncategorized',
-            'category_name': item.category.name if item.category else 'Uncategorized',
-            'isVeg': item.is_veg,
-            'is_veg': item.is_veg,
-            'rating': float(item.rating),
-            'image': item.image,
-            'is_featured': item.is_featured,
-            'is_available': item.is_available
-        })
+        return JsonResponse(menu_item_payload(item))
     except MenuItem.DoesNotExist:
         return JsonResponse({'error': 'Item not found'}, status=404)
 
 
+MAX_BATCH_IDS = 500
+
+
+@csrf_exempt
+@require_http_methods(['GET', 'POST'])
+def menu_batch(request):
+    """Get many menu items by ID in one query
+
+    Accepts ?ids=1,2,3 or a POST body of {"ids": [1, 2, 3]} and returns
+    {"items": {id: item}, "missing": [ids not found]}.
+    """
+    try:
+        if request.method == 'POST':
+            raw_ids = json.loads(request.body or b'{}').get('ids', [])
+        else:
+            raw_ids = [value for value in request.GET.get('ids', '').split(',') if value.strip()]
+        ids = list(dict.fromkeys(int(value) for value in raw_ids))
+    except (AttributeError, TypeError, ValueError):
+        return JsonResponse({'error': 'ids must be a list of integers'}, status=400)
+
+    if not ids:
+        return JsonResponse({'error': 'ids is required'}, status=400)
+    if len(ids) > MAX_BATCH_IDS:
+        return JsonResponse({'error': f'At most {MAX_BATCH_IDS} ids can be requested at once'}, status=400)
+
+    found = MenuItem.objects.select_related('category').in_bulk(ids)
+    return JsonResponse({
+        'items': {str(item_id): menu_item_payload(found[item_id]) for item_id in ids if item_id in found},
+        'missing': [item_id for item_id in ids if item_id not in found],
+    })
+
+
+@export_conditional
 def categories_list(request):
     """Get all categories"""
-    categories = Category.objects.filter(is_active=True).order_by('name')
-    data = []
-    for cat in categories:
-        data.append({
-            'id': cat.id,
-            'name': cat.name,
-            'slug': cat.slug,
-            'description': cat.description,
-            'image': cat.image
-        })
-    return JsonResponse(data, safe=False)
+    response = export_response(request, 'categories')
+    if response is not None:
+        return response
+    return snapshot_response('categories_list', None, build_categories_list)
 
 
+@export_conditional
 def featured_items(request):
     """Get featured menu items"""
-    items = MenuItem.objects.filter(is_available=True, is_featured=True).select_related('category')[:8]
-    data = []
-    for item in items:
-        data.append({
-            'id': item.id,
-            'name': item.name,
-            'description': item.description,
-            'price': float(item.price),
-            'category': item.category.slug if item.category else 'uncategorized',
-            'isVeg': item.is_veg,
-            'rating': float(item.rating),
-            'image': item.image
-        })
-    return JsonResponse(data, safe=False)
+    response = export_response(request, 'featured')
+    if response is not None:
+        return response
+    return snapshot_response('featured_items', None, build_featured_items)
+
+
+@menu_conditional
+def menu_bootstrap(request):
+    """Everything the home page needs in one response
+
+    Returns categories with available item counts, featured items and the
+    first page of the menu (continue paging with menu_list's ?cursor=).
+    """
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), MAX_PAGE_SIZE)
+    except ValueError:
+        return JsonResponse({'error': 'Invalid limit'}, status=400)
+    return snapshot_response('bootstrap', {'limit': limit}, lambda: build_bootstrap(limit))
+
+
+def encode_changes_cursor(moment):
+    return str(int(moment.timestamp() * 1_000_000))
+
+
+def decode_changes_cursor(cursor):
+    return datetime.fromtimestamp(int(cursor) / 1_000_000, tz=dt_timezone.utc)
+
+
+def menu_changes(request):
+    """Menu items and categories changed or deleted since a cursor
+
+    Without ?since=, or with a cursor older than the tombstone retention
+    window, every item and category is returned with "full": true and
+    clients should replace their copy. Each response carries a cursor for
+    the next call. Rows updated within MENU_CHANGES_OVERLAP seconds before
+    the cursor are sent again, so a row whose transaction committed after
+    a later one is not skipped; clients should upsert by id.
+    """
+    since = request.GET.get('since')
+    try:
+        since = decode_changes_cursor(since) if since else None
+    except (ValueError, OverflowError, OSError):
+        return JsonResponse({'error': 'Invalid cursor'}, status=400)
+    if since is not None and since < MenuTombstone.retention_cutoff():
+        since = None
+
+    items = MenuItem.objects.select_related('category').order_by('updated_at', 'id')
+    categories = Category.objects.order_by('updated_at', 'id')
+    tombstones = MenuTombstone.objects.none()
+    if since is not None:
+        window_start = since - timedelta(seconds=settings.MENU_CHANGES_OVERLAP)
+        items = items.filter(updated_at__gte=window_start)
+        categories = categories.filter(updated_at__gte=window_start)
+        tombstones = MenuTombstone.objects.filter(deleted_at__gte=window_start)
+
+    items = list(items)
+    categories = list(categories)
+    tombstones = list(tombstones.values_list('kind', 'object_id', 'deleted_at'))
+
+    moments = [row.updated_at for row in items] + [row.updated_at for row in categories]
+    moments += [deleted_at for _, _, deleted_at in tombstones]
+    if since is not None:
+        # The overlap may return only older rows; never move the cursor back
+        cursor = encode_changes_cursor(max(moments + [since]))
+    elif moments:
+        cursor = encode_changes_cursor(max(moments))
+    else:
+        cursor = encode_changes_cursor(timezone.now())
+
+    return JsonResponse({
+        'items': [menu_item_payload(item) for item in items],
+        'categories': [
+            {
+                'id': cat.id,
+                'name': cat.name,
+                'slug': cat.slug,
+                'description': cat.description,
+                'image': cat.image,
+                'is_active': cat.is_active,
+            }
+            for cat in categories
+        ],
+        'deleted': {
+            'items': [object_id for kind, object_id, _ in tombstones if kind == 'item'],
+            'categories': [object_id for kind, object_id, _ in tombstones if kind == 'category'],
+        },
+        'full': since is None,
+        'cursor': cursor,
+    })
+
+
+def menu_suggest(request):
+    """Autocomplete menu item and category names from an in-memory prefix index"""
+    try:
+        limit = min(max(int(request.GET.get('limit', 8)), 1), 20)
+    except ValueError:
+        limit = 8
+    return JsonResponse(suggest(request.GET.get('q', ''), limit))
 
 
 urlpatterns = [
     path('', menu_list, name='menu-list'),
     path('categories/', categories_list, name='categories-list'),
     path('featured/', featured_items, name='featured-items'),
+    path('suggest/', menu_suggest, name='menu-suggest'),
+    path('batch/', menu_batch, name='menu-batch'),
+    path('bootstrap/', menu_bootstrap, name='menu-bootstrap'),
+    path('changes/', menu_changes, name='menu-changes'),
     path('<int:item_id>/', menu_detail, name='menu-detail'),
 ]
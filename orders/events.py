@@ -0,0 +1,147 @@
+import asyncio
+import json
+import threading
+
+from admin_panel.models import Order
+
+
+# Orders in these states will not change again, so streams end there
+FINAL_STATUSES = ('delivered', 'cancelled')
+KEEPALIVE_SECONDS = 15
+# Streams end after this long; EventSource reconnects and gets the state afresh
+MAX_STREAM_SECONDS = 300
+
+
+def order_state(order):
+    """Public tracking view of an order, as returned by track_order"""
+    return {
+        'order_id': order.id,
+        'status': order.status,
+        'payment_status': order.payment_status,
+        'version': order.version,
+        'total': str(order.total),
+        'created_at': order.created_at.isoformat(),
+        'updated_at': order.updated_at.isoformat(),
+    }
+
+
+class OrderEvents:
+    """In-process fan-out of order state changes to async subscribers
+
+    Subscribers are asyncio queues on the server's event loop; publish() may
+    be called from any thread (sync views run in a thread pool under ASGI).
+    Each queue holds only the latest state, so a slow reader never falls
+    behind. Only changes made in this process are seen: with several
+    worker processes, route a given order's trackers to one of them or
+    replace this with a shared broker.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}  # order id -> {queue: loop}
+
+    def subscribe(self, order_id):
+        queue = asyncio.Queue(maxsize=1)
+        with self._lock:
+            self._subscribers.setdefault(order_id, {})[queue] = asyncio.get_running_loop()
+        return queue
+
+    def unsubscribe(self, order_id, queue):
+        with self._lock:
+            queues = self._subscribers.get(order_id, {})
+            queues.pop(queue, None)
+            if not queues:
+                self._subscribers.pop(order_id, None)
+
+    def subscribed(self, order_ids):
+        """The subset of order_ids somebody is listening to"""
+        with self._lock:
+            return [order_id for order_id in order_ids if order_id in self._subscribers]
+
+    def publish(self, order_id, state):
+        with self._lock:
+            targets = list(self._subscribers.get(order_id, {}).items())
+        for queue, loop in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, queue, state)
+            except RuntimeError:  # the subscriber's loop has closed
+                self.unsubscribe(order_id, queue)
+
+    @staticmethod
+    def _deliver(queue, state):
+        if queue.full():
+            queue.get_nowait()
+        queue.put_nowait(state)
+
+
+order_events = OrderEvents()
+
+
+def publish_order(order):
+    """Push an order's current state to its trackers, if it has any"""
+    if order_events.subscribed([order.pk]):
+        order_events.publish(order.pk, order_state(order))
+
+
+def publish_orders(order_ids):
+    """Push the state of orders changed by a bulk update; reads only tracked orders"""
+    tracked = order_events.subscribed(order_ids)
+    if tracked:
+        for order in Order.objects.filter(pk__in=tracked):
+            order_events.publish(order.pk, order_state(order))
+
+
+def sse_event(state):
+    return f'event: status\ndata: {json.dumps(state)}\n\n'
+
+
+async def order_event_stream(order_id, max_seconds=MAX_STREAM_SECONDS):
+    """Server-Sent Events with the order's state now and after every change
+
+    Subscribes before reading the order so no change can slip in between.
+    Idle streams cost no queries, only a keepalive comment now and then.
+    The stream ends at the final status or after max_seconds.
+    """
+    queue = order_events.subscribe(order_id)
+    try:
+        state = order_state(await Order.objects.aget(pk=order_id))
+        yield sse_event(state)
+        deadline = asyncio.get_running_loop().time() + max_seconds
+        while state['status'] not in FINAL_STATUSES:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                break
+            try:
+                update = await asyncio.wait_for(queue.get(), min(KEEPALIVE_SECONDS, remaining))
+            except asyncio.TimeoutError:
+                if remaining > KEEPALIVE_SECONDS:
+                    yield ': keepalive\n\n'
+                continue
+            if update['version'] > state['version']:
+                state = update
+                yield sse_event(state)
+    finally:
+        order_events.unsubscribe(order_id, queue)
+
+
+async def wait_for_change(order_id, version, timeout):
+    """The order's state once its version differs from version, or None on timeout
+
+    Raises Order.DoesNotExist. Waiting costs no queries: the order is read
+    once up front and once more at the deadline, which also catches changes
+    made by other worker processes.
+    """
+    queue = order_events.subscribe(order_id)
+    try:
+        state = order_state(await Order.objects.aget(pk=order_id))
+        deadline = asyncio.get_running_loop().time() + timeout
+        while state['version'] == version:
+            remaining = deadline - asyncio.get_running_loop().time()
+            try:
+                state = await asyncio.wait_for(queue.get(), max(remaining, 0))
+            except asyncio.TimeoutError:
+                state = order_state(await Order.objects.aget(pk=order_id))
+                return state if state['version'] != version else None
+        return state
+    finally:
+        order_events.unsubscribe(order_id, queue)
@@ -0,0 +1,94 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+from admin_panel.models import Category, MenuItem, Order, OrderItem
+from orders.urls import place_order
+
+
+class Rollback(Exception):
+    pass
+
+
+@api_view(['POST'])
+@permission_classes([AllowAny])
+def legacy_place_order(request):
+    """The original write path: one get and one create per line, no transaction"""
+    payload = request.data
+    order = Order.objects.create(
+        customer_name=payload['customer_name'], customer_email=payload['customer_email'],
+        customer_phone=payload['customer_phone'], order_type=payload['order_type'],
+    )
+    for item in payload['items']:
+        menu_item = None
+        try:
+            menu_item = MenuItem.objects.get(id=item['id'])
+        except MenuItem.DoesNotExist:
+            pass
+        OrderItem.objects.create(
+            order=order, menu_item=menu_item, item_name=item['name'],
+            item_price=Decimal(str(item['price'])), quantity=int(item['quantity'])
+        )
+    return Response({'order_id': order.id}, status=201)
+
+
+class Command(BaseCommand):
+    help = 'Measure orders/sec of place_order at 1, 10 and 50 lines per order'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--orders', type=int, default=200, help='Orders to place per measurement')
+
+    def handle(self, *args, **options):
+        # Everything happens in a transaction that is rolled back at the end
+        try:
+            with transaction.atomic():
+                self.run(options['orders'])
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run(self, count):
+        category = Category.objects.create(name='Bench', slug='bench-place-order')
+        menu_items = MenuItem.objects.bulk_create(
+            MenuItem(name=f'Bench item {i}', description='', price=Decimal('100.00'), category=category)
+            for i in range(50)
+        )
+        factory = APIRequestFactory()
+
+        self.stdout.write(f"{'lines':>5} {'legacy queries':>15} {'legacy orders/s':>16} {'batched queries':>16} {'batched orders/s':>17}")
+        for size in (1, 10, 50):
+            payload = {
+                'customer_name': 'Bench', 'customer_email': 'bench@example.com', 'customer_phone': '0',
+                'order_type': 'dine_in',
+                'items': [
+                    {'id': item.id, 'name': item.name, 'price': '100.00', 'quantity': 2}
+                    for item in menu_items[:size]
+                ],
+            }
+
+            results = []
+            for view in (legacy_place_order, place_order):
+                def post():
+                    response = view(factory.post('/api/orders/', payload, format='json'))
+                    assert response.status_code == 201, response.data
+
+                with CaptureQueriesContext(connection) as queries:
+                    post()
+                started = time.perf_counter()
+                for _ in range(count):
+                    post()
+                elapsed = time.perf_counter() - started
+                results.append((len(queries), count / elapsed))
+
+            (legacy_queries, legacy_rate), (batched_queries, batched_rate) = results
+            self.stdout.write(
+                f'{size:>5} {legacy_queries:>15} {legacy_rate:>16.1f} '
+                f'{batched_queries:>16} {batched_rate:>17.1f}'
+            )
+        self.stdout.write(self.style.SUCCESS('Benchmark complete (created data rolled back)'))
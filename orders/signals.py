@@ -0,0 +1,14 @@
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from admin_panel.models import Order
+from .events import publish_order
+
+
+@receiver(post_save, sender=Order)
+def push_order_state(sender, instance, created, **kwargs):
+    """Tell live trackers about the new state once the change is committed"""
+    if not created:
+        transaction.on_commit(partial(publish_order, instance))
@@ -1,3 +1,265 @@
-from django.test import TestCase
+import asyncio
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import DatabaseError
+from django.db.models import F
+from django.test import AsyncClient, TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from admin_panel.models import DailyItemSales, DailySalesRollup, IdempotencyKey, MenuItem, Order, OrderItem, Reservation
+from .events import order_event_stream, publish_orders
+
+
+class PlaceOrderPricingTests(TestCase):
+    """Orders are priced from the menu, never from the prices the client sends"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.burger = MenuItem.objects.create(name='Burger', price=Decimal('500.00'))
+        self.fries = MenuItem.objects.create(name='Fries', price=Decimal('200.00'))
+
+    def place(self, items, order_type='delivery'):
+        return self.client.post('/api/orders/', {
+            'customer_name': 'Ali', 'customer_email': 'ali@example.com',
+            'customer_phone': '0300', 'order_type': order_type, 'items': items,
+        }, format='json')
+
+    def test_client_prices_are_ignored(self):
+        response = self.place([
+            {'id': self.burger.id, 'name': 'Cheap burger', 'price': 1, 'quantity': 2},
+            {'id': self.fries.id, 'price': 1},
+        ])
+        self.assertEqual(response.status_code, 201)
+        order = Order.objects.get(id=response.json()['order_id'])
+        self.assertEqual(order.subtotal, Decimal('1200.00'))
+        self.assertEqual(order.tax, Decimal('60.00'))
+        self.assertEqual(order.total, Decimal('1410.00'))
+        self.assertEqual(
+            sorted(order.items.values_list('item_name', 'item_price', 'quantity')),
+            [('Burger', Decimal('500.00'), 2), ('Fries', Decimal('200.00'), 1)],
+        )
+
+    def test_no_delivery_fee_for_takeaway(self):
+        response = self.place([{'id': self.fries.id, 'quantity': 1}], order_type='takeaway')
+        self.assertEqual(Order.objects.get(id=response.json()['order_id']).total, Decimal('210.00'))
+
+    def test_price_changes_apply_to_the_next_order(self):
+        self.place([{'id': self.burger.id}])
+        self.burger.price = Decimal('550.00')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.burger.save()
+        response = self.place([{'id': self.burger.id}], order_type='takeaway')
+        self.assertEqual(Order.objects.get(id=response.json()['order_id']).subtotal, Decimal('550.00'))
+
+    def test_changes_from_other_workers_are_picked_up(self):
+        self.place([{'id': self.burger.id}])
+        # Another worker's save: the row changes but this process's menu version does not
+        MenuItem.objects.filter(pk=self.burger.pk).update(price=Decimal('600.00'), updated_at=timezone.now())
+        with self.settings(PRICE_TABLE_MAX_AGE=60):
+            response = self.place([{'id': self.burger.id}], order_type='takeaway')
+            self.assertEqual(Order.objects.get(id=response.json()['order_id']).subtotal, Decimal('500.00'))
+        with self.settings(PRICE_TABLE_MAX_AGE=0):
+            response = self.place([{'id': self.burger.id}], order_type='takeaway')
+            self.assertEqual(Order.objects.get(id=response.json()['order_id']).subtotal, Decimal('600.00'))
+
+    def test_unavailable_and_unknown_items_are_rejected(self):
+        self.fries.is_available = False
+        with self.captureOnCommitCallbacks(execute=True):
+            self.fries.save()
+        for items in ([{'id': self.fries.id}], [{'id': 999999}], [{'name': 'No id'}], [{'id': self.burger.id, 'quantity': 0}]):
+            response = self.place(items)
+            self.assertEqual(response.status_code, 400, items)
+        self.assertFalse(Order.objects.exists())
+
+    def test_failure_partway_leaves_nothing_behind(self):
+        # The lines are inserted, then updating the per-item counters fails
+        with mock.patch.object(DailyItemSales, 'add_many', side_effect=DatabaseError('disk full')):
+            response = self.place([{'id': self.burger.id, 'quantity': 2}, {'id': self.fries.id}])
+        self.assertEqual(response.status_code, 500)
+        self.assertFalse(Order.objects.exists())
+        self.assertFalse(OrderItem.objects.exists())
+        self.assertFalse(DailySalesRollup.objects.exists())
+
+    def test_malformed_lines_are_rejected(self):
+        for items in ([1, [2]], [self.burger.id], {'id': self.burger.id}):
+            response = self.place(items)
+            self.assertEqual(response.status_code, 400, items)
+        self.assertFalse(Order.objects.exists())
+
+
+class IdempotencyKeyTests(TestCase):
+    """Retried POSTs with the same Idempotency-Key replay the first response"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.burger = MenuItem.objects.create(name='Burger', price=Decimal('500.00'))
+        self.order = {
+            'customer_name': 'Ali', 'customer_email': 'ali@example.com', 'customer_phone': '0300',
+            'order_type': 'takeaway', 'items': [{'id': self.burger.id, 'quantity': 1}],
+        }
+
+    def post(self, url, data, key):
+        return self.client.post(url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retried_order_is_placed_once(self):
+        first = self.post('/api/orders/', self.order, 'order-1')
+        retry = self.post('/api/orders/', self.order, 'order-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.status_code, 201)
+        self.assertEqual(retry.json(), first.json())
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(Order.objects.count(), 1)
+
+        self.post('/api/orders/', self.order, 'order-2')
+        self.client.post('/api/orders/', self.order, format='json')
+        self.assertEqual(Order.objects.count(), 3)
+
+    def test_key_reused_for_a_different_request(self):
+        self.post('/api/orders/', self.order, 'order-1')
+        response = self.post('/api/orders/', {**self.order, 'order_type': 'delivery'}, 'order-1')
+        self.assertEqual(response.status_code, 422)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_retried_reservation_is_created_once(self):
+        reservation = {
+            'customer_name': 'Ali', 'customer_email': 'ali@example.com', 'customer_phone': '0300',
+            'date': '2030-01-01', 'time': '19:00', 'party_size': 4,
+        }
+        first = self.post('/api/reservations/create/', reservation, 'booking-1')
+        retry = self.post('/api/reservations/create/', reservation, 'booking-1')
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual(retry.json()['reservation_id'], first.json()['reservation_id'])
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_expired_keys_are_purged_and_reusable(self):
+        self.post('/api/orders/', self.order, 'order-1')
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL + 1))
+        response = self.post('/api/orders/', self.order, 'order-1')
+        self.assertNotIn('Idempotent-Replayed', response)
+        self.assertEqual(Order.objects.count(), 2)
+
+        IdempotencyKey.objects.update(created_at=timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL + 1))
+        self.assertEqual(IdempotencyKey.purge_expired(), 1)
+
+
+class OrderStreamTests(TestCase):
+    """The SSE stream sends the current state, then every committed change"""
+
+    def setUp(self):
+        self.order = Order.objects.create(
+            customer_name='Ali', customer_email='ali@example.com', customer_phone='0300', total=Decimal('500.00'),
+        )
+
+    def update(self, **fields):
+        for field, value in fields.items():
+            setattr(self.order, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.save()
+
+    async def next_event(self, stream):
+        chunk = await asyncio.wait_for(stream.__anext__(), 1)
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        self.assertTrue(chunk.startswith('event: status\n'), chunk)
+        return json.loads(chunk.split('data: ', 1)[1])
+
+    async def test_stream_pushes_changes_until_final_status(self):
+        response = await AsyncClient().get(f'/api/orders/track/{self.order.id}/stream/')
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        stream = aiter(response.streaming_content)
+        self.assertEqual((await self.next_event(stream))['status'], 'pending')
+
+        await sync_to_async(self.update)(status='preparing')
+        self.assertEqual((await self.next_event(stream))['status'], 'preparing')
+
+        # Bulk updates bypass save(); the bulk endpoint publishes them itself
+        await Order.objects.filter(pk=self.order.pk).aupdate(status='delivered', payment_status='paid', version=F('version') + 1)
+        await sync_to_async(publish_orders)([self.order.pk])
+        event = await self.next_event(stream)
+        self.assertEqual((event['status'], event['payment_status']), ('delivered', 'paid'))
+        with self.assertRaises(StopAsyncIteration):
+            await stream.__anext__()
+
+    async def test_unknown_order(self):
+        response = await AsyncClient().get('/api/orders/track/999999/stream/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_wsgi_requests_are_turned_away(self):
+        response = self.client.get(f'/api/orders/track/{self.order.id}/stream/')
+        self.assertEqual(response.status_code, 204)
+
+    async def test_stream_ends_after_max_seconds(self):
+        stream = aiter(order_event_stream(self.order.id, max_seconds=0.05))
+        self.assertEqual((await self.next_event(stream))['status'], 'pending')
+        with self.assertRaises(StopAsyncIteration):
+            await asyncio.wait_for(stream.__anext__(), 1)
+
+
+class TrackOrderLongPollTests(TestCase):
+    """track_order?wait=&version= returns once the order's version moves on, else 304"""
+
+    def setUp(self):
+        self.order = Order.objects.create(
+            customer_name='Ali', customer_email='ali@example.com', customer_phone='0300', total=Decimal('500.00'),
+        )
+
+    def update(self, **fields):
+        for field, value in fields.items():
+            setattr(self.order, field, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.order.save()
+
+    def test_version_moves_only_on_status_or_payment_changes(self):
+        self.assertEqual(self.order.version, 1)
+        self.update(special_instructions='No onions')
+        self.update(status='confirmed')
+        self.assertEqual(self.order.version, 2)
+        self.update(payment_status='paid')
+        self.assertEqual(Order.objects.get(pk=self.order.pk).version, 3)
+
+    def test_bulk_status_update_bumps_versions(self):
+        admin = User.objects.create(username='admin', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        client.post('/api/admin-panel/orders/bulk-status/', {'ids': [self.order.pk], 'status': 'delivered'}, format='json')
+        client.post('/api/admin-panel/orders/bulk-status/', {'ids': [self.order.pk], 'status': 'delivered'}, format='json')
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.payment_status, self.order.version), ('delivered', 'paid', 2))
+
+    def test_bulk_cancel_of_paid_order_bumps_version_once(self):
+        burger = MenuItem.objects.create(name='Burger', price=Decimal('500.00'))
+        OrderItem.objects.create(order=self.order, menu_item=burger, item_name='Burger', item_price=burger.price)
+        self.update(payment_status='paid')
+        admin = User.objects.create(username='admin', is_staff=True)
+        client = APIClient()
+        client.force_authenticate(admin)
+        client.post('/api/admin-panel/orders/bulk-status/', {'ids': [self.order.pk], 'status': 'cancelled'}, format='json')
+        self.order.refresh_from_db()
+        self.assertEqual((self.order.status, self.order.payment_status, self.order.version), ('cancelled', 'refunded', 3))
+        self.assertEqual(DailyItemSales.objects.get(menu_item=burger).quantity, 0)
+
+    async def test_long_poll(self):
+        client = AsyncClient()
+        url = f'/api/orders/track/{self.order.pk}/'
+        self.assertEqual((await client.get(url)).json()['version'], 1)
+        self.assertEqual((await client.get(url, {'wait': 0.05, 'version': 1})).status_code, 304)
+        self.assertEqual((await client.get(url, {'wait': 5, 'version': 0})).json()['version'], 1)
+
+        async def change_soon():
+            await asyncio.sleep(0.05)
+            await sync_to_async(self.update)(status='preparing')
+
+        response, _ = await asyncio.gather(client.get(url, {'wait': 5, 'version': 1}), change_soon())
+        self.assertEqual((response.json()['status'], response.json()['version']), ('preparing', 2))
+
+        self.assertEqual((await client.get(url, {'wait': 'soon', 'version': 1})).status_code, 400)
+        self.assertEqual((await client.get('/api/orders/track/999999/', {'wait': 1, 'version': 1})).status_code, 404)
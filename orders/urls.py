@@ -4,14 +4,25 @@ from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.response import Response
 from rest_framework import status
 from django.contrib.auth.models import User
-from decimal import Decimal
+from django.db import transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
 
 # Import models from admin_panel
-from admin_panel.models import Order, OrderItem, MenuItem
+from admin_panel.models import Order, OrderItem
+from admin_panel.idempotency import idempotent
+from .events import order_event_stream, order_state, wait_for_change
+from menu.pricing import PricingError, price_order, resolve_lines
+
+
+# Longest a long-polling track_order request is held open (seconds)
+MAX_TRACK_WAIT = 30
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])  # Allow both authenticated and guest orders
+@idempotent('orders.place')
 def place_order(request):
     """Place a new order"""
     try:
@@ -35,52 +46,43 @@ def place_order(request):
                 'error': 'No items in order'
             }, status=status.HTTP_400_BAD_REQUEST)
         
-        # Calculate totals
-        subtotal = Decimal('0.00')
-        for item in items:
-            item_price = Decimal(str(item.get('price', 0)))
-            quantity = int(item.get('quantity', 1))
-            subtotal += item_price * quantity
-        
-        tax = subtotal * Decimal('0.05')  # 5% tax
-        delivery_fee = Decimal('150.00') if order_type == 'delivery' else Decimal('0.00')
-        total = subtotal + tax + delivery_fee
-        
-        # Create order
-        order = Order.objects.create(
-            user=user,
-            customer_name=customer_name,
-            customer_email=customer_email,
-            customer_phone=customer_phone,
-            customer_address=customer_address,
-            order_type=order_type,
-            status='pending',
-            payment_status=data.get('payment_status', 'pending'),
-            subtotal=subtotal,
-            tax=tax,
-            total=total,
-            special_instructions=special_instructions,
-            stripe_payment_id=data.get('stripe_payment_id', '')
-        )
+        # Price every line from the menu; client-sent prices are ignored
+        try:
+            resolved = resolve_lines(items)
+        except PricingError as e:
+            return Response({
+                'success': False,
+                'error': str(e)
+            }, status=status.HTTP_400_BAD_REQUEST)
+        lines = [
+            OrderItem(
+                menu_item_id=line['menu_item_id'],
+                item_name=line['name'],
+                item_price=line['price'],
+                quantity=line['quantity']
+            )
+            for line in resolved
+        ]
+        totals = price_order(resolved, order_type)
         
-        # Create order items
-        for item in items:
-            # Try to find menu item
-            menu_item = None
-            item_id = item.get('id') or item.get('menu_item_id')
-            if item_id:
-                try:
-                    menu_item = MenuItem.objects.get(id=item_id)
-                except MenuItem.DoesNotExist:
-                    pass
-            
-            OrderItem.objects.create(
-                order=order,
-                menu_item=menu_item,
-                item_name=item.get('name', 'Unknown Item'),
-                item_price=Decimal(str(item.get('price', 0))),
-                quantity=int(item.get('quantity', 1))
+        # Create the order and all its lines together, or nothing at all
+        with transaction.atomic():
+            order = Order.objects.create(
+                user=user,
+                customer_name=customer_name,
+                customer_email=customer_email,
+                customer_phone=customer_phone,
+                customer_address=customer_address,
+                order_type=order_type,
+                status='pending',
+                payment_status=data.get('payment_status', 'pending'),
+                subtotal=totals['subtotal'],
+                tax=totals['tax'],
+                total=totals['total'],
+                special_instructions=special_instructions,
+                stripe_payment_id=data.get('stripe_payment_id', '')
             )
+            OrderItem.bulk_create_for_order(order, lines)
         
         return Response({
             'success': True,
@@ -143,23 +145,54 @@ def order_history(request, user_id=None):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
-@api_view(['GET'])
-def track_order(request, order_id):
-    """Track order status"""
+@require_GET
+async def track_order(request, order_id):
+    """Track order status
+
+    Long-poll with ?wait=<seconds>&version=<n>: the response is held until
+    the order's version differs from n (up to MAX_TRACK_WAIT seconds) and
+    is 304 Not Modified if it did not change. Waiting requests sit on the
+    event loop, not a worker thread, when served over ASGI.
+    """
     try:
-        order = Order.objects.get(id=order_id)
-        return Response({
-            'order_id': order.id,
-            'status': order.status,
-            'payment_status': order.payment_status,
-            'total': str(order.total),
-            'created_at': order.created_at.isoformat(),
-            'updated_at': order.updated_at.isoformat()
-        })
+        wait = min(float(request.GET.get('wait', 0)), MAX_TRACK_WAIT)
+        version = int(request.GET['version']) if 'version' in request.GET else None
+    except ValueError:
+        return JsonResponse({
+            'error': 'wait must be a number and version an integer'
+        }, status=400)
+    try:
+        if version is None or not wait > 0:
+            return JsonResponse(order_state(await Order.objects.aget(id=order_id)))
+        state = await wait_for_change(order_id, version, wait)
     except Order.DoesNotExist:
-        return Response({
+        return JsonResponse({
+            'error': 'Order not found'
+        }, status=404)
+    if state is None:
+        return HttpResponseNotModified()
+    return JsonResponse(state)
+
+
+@require_GET
+async def track_order_stream(request, order_id):
+    """Stream order status changes as Server-Sent Events
+
+    Needs an ASGI server (e.g. `uvicorn core.asgi:application`). Under
+    WSGI Django would buffer the whole stream in a worker thread before
+    sending anything, so WSGI requests get a 204 at once; EventSource
+    stops on it and clients fall back to long-polling track_order.
+    """
+    if not isinstance(request, ASGIRequest):
+        return HttpResponse(status=204)
+    if not await Order.objects.filter(id=order_id).aexists():
+        return JsonResponse({
             'error': 'Order not found'
-        }, status=status.HTTP_404_NOT_FOUND)
+        }, status=404)
+    response = StreamingHttpResponse(order_event_stream(order_id), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # don't let nginx buffer the stream
+    return response
 
 
 urlpatterns = [
@@ -167,4 +200,5 @@ urlpatterns = [
     path('history/', order_history, name='order-history'),
     path('history/<int:user_id>/', order_history, name='order-history-user'),
     path('track/<int:order_id>/', track_order, name='track-order'),
+    path('track/<int:order_id>/stream/', track_order_stream, name='track-order-stream'),
 ]
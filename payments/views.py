@@ -7,6 +7,9 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 import os
+from decimal import Decimal, ROUND_HALF_UP
+
+from menu.pricing import PricingError, price_order, resolve_lines
 
 # Initialize Stripe with secret key
 stripe.api_key = settings.STRIPE_SECRET_KEY
@@ -14,6 +17,12 @@ stripe.api_key = settings.STRIPE_SECRET_KEY
 # Frontend URL - uses environment variable or defaults to localhost:5173
 FRONTEND_URL = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
 
+
+def to_paisa(amount):
+    """Convert a rupee Decimal to Stripe's smallest currency unit"""
+    return int((amount * 100).quantize(Decimal('1'), rounding=ROUND_HALF_UP))
+
+
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_stripe_config(request):
@@ -53,24 +62,47 @@ def create_checkout_session(request):
                 'quantity': 1,
             })
         else:
-            # Food order payment
-            for item in items:
+            # Food order payment, priced from the menu rather than the cart.
+            # Online checkout is only offered for delivery orders.
+            try:
+                lines = resolve_lines(items)
+            except PricingError as e:
+                return Response({
+                    'error': str(e)
+                }, status=status.HTTP_400_BAD_REQUEST)
+            if not lines:
+                return Response({
+                    'error': 'No items in order'
+                }, status=status.HTTP_400_BAD_REQUEST)
+            totals = price_order(lines, 'delivery')
+            descriptions = {str(item.get('id') or item.get('menu_item_id')): item.get('description', '') for item in items}
+            for line in lines:
                 # Ensure description is not empty
-                description = item.get('description', '')
+                description = descriptions.get(str(line['menu_item_id'])) or ''
                 if not description or description.strip() == '':
-                    description = f"Delicious {item.get('name', 'Food Item')}"
+                    description = f"Delicious {line['name']}"
                 
                 line_items.append({
                     'price_data': {
                         'currency': 'pkr',
                         'product_data': {
-                            'name': item.get('name', 'Food Item'),
+                            'name': line['name'],
                             'description': description,
                         },
-                        'unit_amount': int(float(item.get('price', 0)) * 100),  # Convert to paisa
+                        'unit_amount': to_paisa(line['price']),
                     },
-                    'quantity': item.get('quantity', 1),
+                    'quantity': line['quantity'],
                 })
+            for name, amount in (('Tax (5%)', totals['tax']), ('Delivery Fee', totals['delivery_fee'])):
+                if amount:
+                    line_items.append({
+                        'price_data': {
+                            'currency': 'pkr',
+                            'product_data': {'name': name},
+                            'unit_amount': to_paisa(amount),
+                        },
+                        'quantity': 1,
+                    })
         
         # Create Checkout Session with frontend URLs
         checkout_session = stripe.checkout.Session.create(
@@ -7,10 +7,12 @@ from datetime import datetime
 
 # Import models from admin_panel
 from admin_panel.models import Reservation
+from admin_panel.idempotency import idempotent
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])  # Allow both authenticated and guest reservations
+@idempotent('reservations.create')
 def create_reservation(request):
     """Create a new reservation"""
     try: